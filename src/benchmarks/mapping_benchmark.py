@@ -0,0 +1,140 @@
+# Import required libraries
+import os
+import time
+import argparse
+import numpy as np
+from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.ingestion.elastic_bible import load_mapping, create_index, ingest_csv, BASE_DATA_DIR
+from src.query.explorer_queries import connect_es, build_base_query, build_study_query
+
+# Mapping profiles to compare: the original defaults vs the tuned profile,
+# and whether English queries use the tuned verse_part.lower / .shingles subfields
+MAPPING_PROFILES = {
+    "baseline": ("verse_mapping_baseline.json", False),
+    "tuned": ("verse_mapping.json", True)
+}
+
+# (kind, search_type, term): IDs hit hebrew_id, words verse_part.lower, phrases verse_part.shingles
+SAMPLE_QUERIES = [
+    ("id", "Strong's ID", "H430"), ("id", "Strong's ID", "H3068"), ("id", "Strong's ID", "H2617"),
+    ("id", "Strong's ID", "G26"), ("id", "Strong's ID", "G2316"), ("id", "Strong's ID", "G1411"),
+    ("word", "English word", "love"), ("word", "English word", "mercy"), ("word", "English word", "heaven"),
+    ("word", "English word", "lord"),
+    ("phrase", "English word", "the lord"), ("phrase", "English word", "kingdom of heaven"),
+    ("phrase", "English word", "the son of man"), ("phrase", "English word", "his mercy")
+]
+QUERY_KINDS = ["id", "word", "phrase"]
+
+
+def build_bench_index(es, profile, versions):
+    """
+    Creates and loads a benchmark index for one mapping profile.
+
+    :param es: Elasticsearch client instance.
+    :param profile: Key of MAPPING_PROFILES.
+    :param versions: Bible versions to ingest.
+    :return: Tuple of (index_name, ingest_seconds).
+    """
+    index_name = f"{cfg.ES_VERSE_INDEX_NAME}_bench_{profile}"
+    create_index(es, index_name, load_mapping(MAPPING_PROFILES[profile][0]))
+
+    start = time.time()
+    for version in versions:
+        version_path = os.path.join(BASE_DATA_DIR, cfg.VERSE_DATA_FOLDER, version)
+        for file in sorted(f for f in os.listdir(version_path) if f.endswith(".csv")):
+            ingest_csv(es, index_name, os.path.join(version_path, file))
+    es.indices.refresh(index=index_name)
+    ingest_seconds = time.time() - start
+
+    # Merge down so disk size reflects the mapping rather than segment churn
+    es.indices.forcemerge(index=index_name, max_num_segments=1)
+    es.indices.refresh(index=index_name)
+    return index_name, ingest_seconds
+
+
+def store_size_bytes(es, index_name):
+    """Return the primary store size of an index in bytes."""
+    stats = es.indices.stats(index=index_name, metric="store")
+    return stats["indices"][index_name]["primaries"]["store"]["size_in_bytes"]
+
+
+def first_query_ms(es, index_name, version):
+    """
+    Time the first aggregation after a refresh, when global ordinals have to be
+    rebuilt unless they are loaded eagerly.
+    """
+    es.index(index=index_name, document={"version": version, "bible_book": "~bench", "bible_chapter": 0,
+                                         "bible_verse": "~bench", "hebrew_id": "~bench", "verse_part": ""},
+             refresh=True)
+    body = build_study_query(build_base_query("Strong's ID", "H430", version))
+    start = time.perf_counter()
+    es.search(index=index_name, body=body, request_cache=False)
+    elapsed = (time.perf_counter() - start) * 1000
+    es.delete_by_query(index=index_name, query={"term": {"bible_verse": "~bench"}}, refresh=True)
+    return elapsed
+
+
+def query_latencies_ms(es, index_name, version, repeats, subfields):
+    """
+    Time every sample term, bypassing the request cache: the bare lookup
+    (matching and counting parts) and the explorer's full study query.
+
+    :return: Dict of (kind, "lookup"|"study") -> array of latencies in ms.
+    """
+    latencies = {}
+    for _ in range(repeats):
+        for kind, search_type, term in SAMPLE_QUERIES:
+            base_query = build_base_query(search_type, term, version, subfields=subfields)
+            bodies = {"lookup": {"size": 0, "query": base_query, "track_total_hits": True},
+                      "study": build_study_query(base_query)}
+            for name, body in bodies.items():
+                start = time.perf_counter()
+                es.search(index=index_name, body=body, request_cache=False)
+                latencies.setdefault((kind, name), []).append((time.perf_counter() - start) * 1000)
+    return {key: np.array(values) for key, values in latencies.items()}
+
+
+def run_benchmark(es, versions, repeats=20, keep=False):
+    """
+    Load each mapping profile into its own index and compare ingest time,
+    disk size, first-query latency and steady-state query latency.
+
+    :param es: Elasticsearch client instance.
+    :param versions: Bible versions to ingest.
+    :param repeats: Number of passes over SAMPLE_QUERIES.
+    :param keep: Keep the benchmark indices instead of deleting them.
+    :return: Dict of results per profile.
+    """
+    results = {}
+    for profile, (_, subfields) in MAPPING_PROFILES.items():
+        index_name, ingest_seconds = build_bench_index(es, profile, versions)
+        latencies = query_latencies_ms(es, index_name, versions[0], repeats, subfields)
+        results[profile] = {
+            "ingest_s": ingest_seconds,
+            "store_mb": store_size_bytes(es, index_name) / 1024 ** 2,
+            "first_query_ms": first_query_ms(es, index_name, versions[0]),
+            **{f"{kind}_{name}_p50_ms": float(np.percentile(values, 50)) for (kind, name), values in latencies.items()},
+            "p95_ms": float(np.percentile(np.concatenate(list(latencies.values())), 95))
+        }
+        if not keep:
+            es.indices.delete(index=index_name)
+    return results
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the baseline and tuned verse index mappings.")
+    parser.add_argument("--versions", nargs="+", default=["KJV"])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark indices")
+    args = parser.parse_args()
+
+    results = run_benchmark(connect_es(), args.versions, repeats=args.repeats, keep=args.keep)
+
+    print(f"\n📊 Mapping benchmark ({', '.join(args.versions)}, {args.repeats} repeats; p50 ms lookup / study)")
+    print(f"{'profile':<10}{'ingest s':>10}{'store MB':>10}{'1st query ms':>14}"
+          + "".join(f"{kind:>16}" for kind in QUERY_KINDS) + f"{'p95 ms':>9}")
+    for profile, r in results.items():
+        print(f"{profile:<10}{r['ingest_s']:>10.1f}{r['store_mb']:>10.1f}{r['first_query_ms']:>14.1f}"
+              + "".join(f"{r[f'{kind}_lookup_p50_ms']:>8.1f} /{r[f'{kind}_study_p50_ms']:>6.1f}" for kind in QUERY_KINDS)
+              + f"{r['p95_ms']:>9.1f}")
@@ -5,4 +5,51 @@ VERSE_DATA_FOLDER = "verse_data"
 ES_VERSE_INDEX_NAME = "verse_index"
 ES_STRONGS_INDEX_NAME = "strongs_id_index"
 ES_BASE_DIR = "../scraped_docs"
-ES_TIMEOUT = 30
\ No newline at end of file
+ES_TIMEOUT = 30
+DERIVED_DATA_FOLDER = "derived"
+VERSE_DATA_CACHE_FILE = "verse_data.parquet"  # Cleaned verse CSVs, shared by the derived-data pipeline steps
+NETWORK_DATA_FOLDER = "networks"
+NETWORK_TOP_K = 25
+BIBLE_VERSIONS = ["ASV", "KJV", "ESV", "NIV", "NLT", "LXX"]
+BATCH_MSEARCH_SIZE = 50
+BATCH_MAX_CONCURRENCY = 4
+ALIGNMENT_DATA_FOLDER = "alignment"
+ALIGNMENT_FILE = "verse_alignment.parquet"
+INDEX_GENERATION_FILE = "index_generation.json"
+CACHE_MAX_ENTRIES = 2048
+CACHE_TTL_SECONDS = 3600
+CACHE_DISK_FILE = "query_cache.sqlite"  # Shared by the app, API workers and warmup job; None keeps caches in-process
+CACHE_GENERATION_CHECK_SECONDS = 5
+CACHE_DISK_PRUNE_EVERY = 100  # SQLite rows are trimmed to CACHE_MAX_ENTRIES once per this many writes
+BIBLE_BOOKS = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", "Joshua", "Judges", "Ruth",
+    "1 Samuel", "2 Samuel", "1 Kings", "2 Kings", "1 Chronicles", "2 Chronicles", "Ezra",
+    "Nehemiah", "Esther", "Job", "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon",
+    "Isaiah", "Jeremiah", "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
+    "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah", "Haggai", "Zechariah",
+    "Malachi", "Matthew", "Mark", "Luke", "John", "Acts", "Romans", "1 Corinthians",
+    "2 Corinthians", "Galatians", "Ephesians", "Philippians", "Colossians", "1 Thessalonians",
+    "2 Thessalonians", "1 Timothy", "2 Timothy", "Titus", "Philemon", "Hebrews", "James",
+    "1 Peter", "2 Peter", "1 John", "2 John", "3 John", "Jude", "Revelation"
+]
+CONTEXT_MAX_RADIUS = 5
+BITMAP_DATA_FOLDER = "verse_bitmaps"
+EXPORT_PAGE_SIZE = 5000
+EXPORT_KEEP_ALIVE = "2m"
+COMPOSITE_PAGE_SIZE = 1000
+EMBEDDING_DATA_FOLDER = "embeddings"
+EMBEDDING_DIM = 128
+EMBEDDING_CONTEXT_ALPHA = 0.75
+RELATED_WORDS_TOP_K = 15
+API_HOST = "0.0.0.0"
+API_PORT = 8000
+API_WORKERS = 4
+API_ES_CONNECTIONS_PER_NODE = 10
+API_GZIP_MIN_BYTES = 1000
+LEXICON_DATA_FOLDER = "lexicon"
+LEXICON_TOP_K = 20
+LEXICON_MIN_SIMILARITY = 0.4
+WARMUP_TOP_N = 10
+WARMUP_CONCURRENCY = 4
+WARMUP_ON_STARTUP = False
+EXPORT_DOWNLOAD_MAX_ROWS = 400_000  # ~100 MB as CSV; larger UI exports are pointed at the streaming API/CLI
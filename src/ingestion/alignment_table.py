@@ -0,0 +1,104 @@
+# Import required libraries
+import os
+import time
+from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.utils.verse_data import DERIVED_DIR, VERSE_DATA_DIR, load_verse_data
+
+# Define the directory the alignment table is written to
+ALIGNMENT_DIR = os.path.join(DERIVED_DIR, cfg.ALIGNMENT_DATA_FOLDER)
+
+ALIGNMENT_KEY_COLUMNS = ["verse_key", "hebrew_id"]
+REFERENCE_COLUMNS = ["bible_book", "bible_chapter", "bible_verse"]
+RENDERING_SEPARATOR = " | "
+
+
+def load_verse_parts(folder=VERSE_DATA_DIR):
+    """
+    Loads the verse parts that carry a Strong's ID, across all versions.
+
+    Versions spell references differently ("2 Samuel1:1" vs "2 Samuel2Sa 1:1"),
+    so verses are identified by their canonical verse_key, not the scraped string.
+
+    :param folder: Path to the verse_data folder with version-named subdirectories.
+    :return: DataFrame with the alignment key and reference columns, version and verse_part.
+    """
+    verse_parts = load_verse_data(folder, usecols=REFERENCE_COLUMNS + ["hebrew_id", "version", "verse_part"])
+    return verse_parts.dropna(subset=["hebrew_id"])
+
+
+def build_alignment_table(verse_parts):
+    """
+    Pivots verse parts into one row per (verse_key, Strong's ID) with one
+    rendering column per version.
+
+    When a version renders the same ID more than once in a verse, the
+    distinct renderings are joined in verse order. The reference columns
+    come from the first version (in BIBLE_VERSIONS order) that has the verse.
+
+    :param verse_parts: Output of load_verse_parts.
+    :return: DataFrame with verse_key, the reference columns, hebrew_id and a column per version,
+             sorted by (hebrew_id, verse_key).
+    """
+    renderings = (
+        verse_parts[verse_parts["verse_part"] != ""]
+        .drop_duplicates(subset=ALIGNMENT_KEY_COLUMNS + ["version", "verse_part"])
+        .groupby(ALIGNMENT_KEY_COLUMNS + ["version"], sort=False)["verse_part"]
+        .agg(RENDERING_SEPARATOR.join)
+    )
+    table = renderings.unstack("version")
+
+    # Keep (verse, ID) pairs that only occur in versions without English text (e.g. LXX)
+    keys = verse_parts[ALIGNMENT_KEY_COLUMNS].drop_duplicates().set_index(ALIGNMENT_KEY_COLUMNS).index
+    table = table.reindex(keys)
+
+    versions = [v for v in cfg.BIBLE_VERSIONS if v in set(verse_parts["version"])]
+    table = table.reindex(columns=versions).fillna("").reset_index()
+
+    # One display reference per verse
+    version_rank = verse_parts["version"].map({v: i for i, v in enumerate(cfg.BIBLE_VERSIONS)})
+    references = (verse_parts.assign(version_rank=version_rank)
+                  .sort_values("version_rank", kind="stable")
+                  .drop_duplicates("verse_key")[["verse_key"] + REFERENCE_COLUMNS])
+    table = table.merge(references, on="verse_key", how="left")
+    table = table[["verse_key"] + REFERENCE_COLUMNS + ["hebrew_id"] + versions]
+
+    # Canonical ordering within each ID, so lookups come back in Bible order
+    return table.sort_values(["hebrew_id", "verse_key"], kind="stable", ignore_index=True)
+
+
+def check_alignment_table(table):
+    """
+    Verifies that every (verse_key, hebrew_id) pair has exactly one row, i.e.
+    that no version's renderings ended up on a separate row.
+
+    :param table: Output of build_alignment_table.
+    :raises ValueError: If any pair is duplicated.
+    """
+    duplicated = table.duplicated(subset=ALIGNMENT_KEY_COLUMNS, keep=False)
+    if duplicated.any():
+        sample = table.loc[duplicated, ALIGNMENT_KEY_COLUMNS].head(5).to_dict("records")
+        raise ValueError(f"{int(duplicated.sum()):,} alignment rows share a (verse_key, hebrew_id), e.g. {sample}")
+
+
+def save_alignment_table(table, out_dir=ALIGNMENT_DIR):
+    """
+    Writes the alignment table to a compressed Parquet file.
+
+    :param table: Output of build_alignment_table.
+    :param out_dir: Folder the Parquet file is written to.
+    :return: Path of the written file.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, cfg.ALIGNMENT_FILE)
+    table.to_parquet(path, index=False, compression="zstd", row_group_size=50_000)
+    return path
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    start = time.time()
+    verse_parts = load_verse_parts()
+    table = build_alignment_table(verse_parts)
+    check_alignment_table(table)
+    path = save_alignment_table(table)
+    print(f"✅ Wrote {len(table):,} aligned (verse, Strong's ID) rows to {path} in {time.time() - start:.1f}s")
@@ -0,0 +1,90 @@
+# Import required libraries
+import os
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.utils.verse_data import DERIVED_DIR, VERSE_DATA_DIR, load_verse_data
+
+# Define the directory the precomputed networks are written to
+NETWORK_DIR = os.path.join(DERIVED_DIR, cfg.NETWORK_DATA_FOLDER)
+
+
+def version_pairs(verse_data):
+    """
+    The distinct (verse_key, hebrew_id) pairs of each Bible version.
+
+    :param verse_data: Output of load_verse_data with version, verse_key and hebrew_id.
+    :return: Dict of version -> DataFrame with one row per Strong's ID per verse.
+    """
+    # A verse only counts once towards an edge, however often the ID repeats in it
+    pairs = verse_data.dropna(subset=["hebrew_id"]).drop_duplicates(["version", "verse_key", "hebrew_id"])
+    return {version: group[["verse_key", "hebrew_id"]] for version, group in pairs.groupby("version")}
+
+
+def build_cooccurrence_matrix(pairs):
+    """
+    Builds a weighted Strong's ID co-occurrence graph from verse/ID pairs.
+
+    The verse x ID incidence matrix is multiplied by its transpose, so the
+    weight of edge (a, b) is the number of verses containing both a and b.
+    The diagonal is split off as the number of verses each ID appears in.
+
+    :param pairs: DataFrame of distinct (verse_key, hebrew_id) pairs.
+    :return: Tuple of (ids, verse_counts, adjacency) where adjacency is a
+             symmetric scipy CSR matrix with an empty diagonal.
+    """
+    verse_codes, verses = pd.factorize(pairs["verse_key"])
+    id_codes, ids = pd.factorize(pairs["hebrew_id"], sort=True)
+
+    incidence = sp.csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (verse_codes, id_codes)),
+        shape=(len(verses), len(ids))
+    )
+    adjacency = (incidence.T @ incidence).tocsr()
+
+    verse_counts = adjacency.diagonal().astype(np.int32)
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+    adjacency.sort_indices()
+
+    return np.asarray(ids, dtype=str), verse_counts, adjacency
+
+
+def save_network(version, ids, verse_counts, adjacency, out_dir=NETWORK_DIR):
+    """
+    Writes a version's network to disk as a sparse .npz plus an ID table.
+
+    :param version: Bible version the network was built from (e.g. "KJV").
+    :param ids: Array of Strong's IDs, ordered as the matrix rows.
+    :param verse_counts: Number of verses each ID appears in.
+    :param adjacency: Symmetric CSR matrix of co-occurrence counts.
+    :param out_dir: Folder the network files are written to.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    sp.save_npz(os.path.join(out_dir, f"{version}_edges.npz"), adjacency, compressed=True)
+    pd.DataFrame({"hebrew_id": ids, "verse_count": verse_counts}).to_csv(
+        os.path.join(out_dir, f"{version}_nodes.csv"), index=False
+    )
+
+
+def build_all_networks(folder=VERSE_DATA_DIR, out_dir=NETWORK_DIR):
+    """
+    Builds and saves a co-occurrence network for every version.
+
+    :param folder: Path to the verse_data folder with version-named subdirectories.
+    :param out_dir: Folder the network files are written to.
+    """
+    verse_data = load_verse_data(folder, usecols=["version", "hebrew_id"])
+    for version, pairs in version_pairs(verse_data).items():
+        start = time.time()
+        ids, verse_counts, adjacency = build_cooccurrence_matrix(pairs)
+        save_network(version, ids, verse_counts, adjacency, out_dir=out_dir)
+        print(f"✅ Built {version} network: {len(ids):,} IDs, {adjacency.nnz // 2:,} edges "
+              f"in {time.time() - start:.1f}s")
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    build_all_networks()
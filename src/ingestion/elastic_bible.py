@@ -7,6 +7,8 @@ from elasticsearch import Elasticsearch
 from elasticsearch.helpers import bulk
 import streamlit as st
 from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.query.result_cache import publish_index_generation
+from src.utils.verse_keys import verse_keys_for
 
 # Define the directory containing Elasticsearch index mappings (JSON format)
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'config', 'es_mappings')
@@ -83,6 +85,11 @@ def ingest_csv(es, index_name, filepath):
     # Replace NaN values with empty strings for clean ingestion
     df = df.fillna("")
 
+    # Add the canonical integer verse key (null when the reference can't be parsed)
+    if 'bible_verse' in df.columns:
+        verse_keys = verse_keys_for(df)
+        df["verse_key"] = verse_keys.astype(object).where(verse_keys.notna(), None)
+
     # Create a list of ES bulk actions from dataframe rows
     actions = [{"_index": index_name, "_source": row.to_dict()} for _, row in df.iterrows()]
 
@@ -133,3 +140,7 @@ if __name__ == "__main__":
     create_index(es, cfg.ES_STRONGS_INDEX_NAME, strongs_mapping)  # Create strongs index
     ingest_csvs_in_folder(es, cfg.ES_STRONGS_INDEX_NAME, os.path.join(BASE_DATA_DIR,cfg.STRONGS_DATA_FOLDER,'Hebrew'), nested=False)  # Ingest Hebrew ID csvs
     ingest_csvs_in_folder(es, cfg.ES_STRONGS_INDEX_NAME, os.path.join(BASE_DATA_DIR,cfg.STRONGS_DATA_FOLDER,'Greek'), nested=False)  # Ingest Greek ID csvs
+
+    # ---- STEP 3: Publish a new index generation so query result caches are invalidated ----
+    generation = publish_index_generation()
+    print(f"✅ Published index generation {generation}")
@@ -0,0 +1,116 @@
+# Import required libraries
+import os
+import re
+import time
+import unicodedata
+import numpy as np
+import pandas as pd
+from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.utils.verse_data import DATA_DIR, DERIVED_DIR
+
+# Define the directory the lexicon trigram index is written to
+LEXICON_DIR = os.path.join(DERIVED_DIR, cfg.LEXICON_DATA_FOLDER)
+
+LEXICON_COLUMNS = {
+    "strongs_id": "strongs_id", "Original Word": "original_word", "Part of Speech": "part_of_speech",
+    "Transliteration": "transliteration", "Pronunciation": "pronunciation",
+    "Phonetic Spelling": "phonetic_spelling", "KJV": "kjv", "NASB": "nasb", "Word Origin": "word_origin"
+}
+SEARCH_FIELDS = ["original_word", "transliteration", "kjv", "nasb"]
+WORD_PATTERN = re.compile(r"\w+")
+JOINER_PATTERN = re.compile(r"[()\-]")  # "(loving-)kindness" should also match "lovingkindness"
+
+
+def fold(text):
+    """
+    Fold text for diacritic-insensitive matching: decompose (NFD), drop every
+    combining mark (Hebrew niqqud and cantillation, Greek accents and
+    breathings, Latin diacritics) and casefold (which also maps final sigma).
+    """
+    decomposed = unicodedata.normalize("NFD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def fold_words(text):
+    """Folded word tokens of a lexicon field or query (shared with the query side)."""
+    return WORD_PATTERN.findall(fold(text).replace("_", " "))
+
+
+def index_words(text):
+    """Distinct folded words of a field, plus the compounds formed by dropping hyphens and parentheses."""
+    return sorted(set(fold_words(text)) | set(fold_words(JOINER_PATTERN.sub("", str(text)))))
+
+
+def trigrams(word):
+    """Distinct trigrams of a word padded like pg_trgm ("  ab" / "ab "), so short words still match."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_lexicon(folder):
+    """
+    Loads every Strong's lookup table under id_lookups with snake_case columns.
+
+    :param folder: Path to the id_lookups folder (Hebrew/ and Greek/ subfolders).
+    :return: DataFrame with one row per Strong's ID.
+    """
+    frames = []
+    for language in sorted(os.listdir(folder)):
+        language_path = os.path.join(folder, language)
+        if language.startswith('.') or not os.path.isdir(language_path):
+            continue
+        for file in sorted(f for f in os.listdir(language_path) if f.endswith(".csv")):
+            frames.append(pd.read_csv(os.path.join(language_path, file), dtype=str, keep_default_na=False))
+    df = pd.concat(frames, ignore_index=True).rename(columns=LEXICON_COLUMNS)
+    return df[list(LEXICON_COLUMNS.values())].drop_duplicates("strongs_id").reset_index(drop=True)
+
+
+def build_trigram_index(lexicon):
+    """
+    Builds a two-level trigram index in CSR layout: trigram -> words and
+    word -> lexicon entries, over the folded words of the searchable fields.
+
+    :param lexicon: Output of load_lexicon.
+    :return: Dict of arrays ready for np.savez.
+    """
+    word_entries = pd.DataFrame({
+        "entry": np.repeat(np.arange(len(lexicon)), len(SEARCH_FIELDS)),
+        "word": lexicon[SEARCH_FIELDS].to_numpy().ravel()
+    })
+    word_entries["word"] = word_entries["word"].map(index_words)
+    word_entries = word_entries.explode("word").dropna().drop_duplicates()
+    word_codes, words = pd.factorize(word_entries["word"], sort=True)
+
+    gram_pairs = pd.DataFrame({"word": np.arange(len(words)), "gram": [sorted(trigrams(w)) for w in words]})
+    gram_pairs = gram_pairs.explode("gram")
+    gram_codes, grams = pd.factorize(gram_pairs["gram"], sort=True)
+
+    def csr(keys, values, n_keys):
+        order = np.lexsort((values, keys))
+        offsets = np.zeros(n_keys + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=n_keys), out=offsets[1:])
+        return offsets, values[order].astype(np.uint32)
+
+    gram_offsets, gram_postings = csr(gram_codes, gram_pairs["word"].to_numpy(dtype=np.int64), len(grams))
+    word_offsets, word_postings = csr(word_codes, word_entries["entry"].to_numpy(dtype=np.int64), len(words))
+    word_gram_counts = np.bincount(gram_pairs["word"].to_numpy(dtype=np.int64), minlength=len(words))
+    return {"words": np.asarray(words, dtype=str), "word_gram_counts": word_gram_counts,
+            "grams": np.asarray(grams, dtype=str), "gram_offsets": gram_offsets, "gram_postings": gram_postings,
+            "word_offsets": word_offsets, "word_postings": word_postings}
+
+
+def save_lexicon_index(lexicon, arrays, out_dir=LEXICON_DIR):
+    """Writes the lexicon entries as a CSV and the trigram index arrays as an .npz in matching row order."""
+    os.makedirs(out_dir, exist_ok=True)
+    lexicon.to_csv(os.path.join(out_dir, "lexicon.csv"), index=False)
+    np.savez(os.path.join(out_dir, "lexicon_trigrams.npz"), **arrays)
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    start = time.time()
+    lexicon = load_lexicon(os.path.join(DATA_DIR, cfg.STRONGS_DATA_FOLDER))
+    arrays = build_trigram_index(lexicon)
+    save_lexicon_index(lexicon, arrays)
+    print(f"✅ Built lexicon trigram index: {len(lexicon):,} entries, {len(arrays['words']):,} words, "
+          f"{len(arrays['grams']):,} trigrams in {time.time() - start:.1f}s")
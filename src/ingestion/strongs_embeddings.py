@@ -0,0 +1,110 @@
+# Import required libraries
+import os
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.linalg import svds
+from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.utils.verse_data import DERIVED_DIR, VERSE_DATA_DIR, load_verse_data
+
+# Define the directory the embedding matrix and vocabulary are written to
+EMBEDDING_DIR = os.path.join(DERIVED_DIR, cfg.EMBEDDING_DATA_FOLDER)
+
+
+def load_verse_ids(folder=VERSE_DATA_DIR):
+    """
+    Loads every verse part that carries a Strong's ID, across all versions.
+
+    :param folder: Path to the verse_data folder with version-named subdirectories.
+    :return: DataFrame with version, verse_key, hebrew_id and verse_part columns.
+    """
+    verse_ids = load_verse_data(folder, usecols=["version", "hebrew_id", "verse_part"])
+    return verse_ids.dropna(subset=["hebrew_id"])
+
+
+def build_ppmi_matrix(verse_ids, alpha=cfg.EMBEDDING_CONTEXT_ALPHA):
+    """
+    Builds a sparse positive PMI matrix from verse-level ID co-occurrence.
+
+    Each (version, verse) is one context. Context counts are smoothed with
+    exponent alpha, which damps PMI for very rare IDs.
+
+    :param verse_ids: Output of load_verse_ids.
+    :param alpha: Context distribution smoothing exponent.
+    :return: Tuple of (ids, verse_counts, ppmi) where ppmi is a symmetric CSR matrix.
+    """
+    pairs = verse_ids[["version", "verse_key", "hebrew_id"]].drop_duplicates()
+    context_codes = pairs.groupby(["version", "verse_key"], sort=False).ngroup().to_numpy()
+    id_codes, ids = pd.factorize(pairs["hebrew_id"], sort=True)
+
+    incidence = sp.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float64), (context_codes, id_codes)),
+        shape=(context_codes.max() + 1, len(ids))
+    )
+    cooc = (incidence.T @ incidence).tocoo()
+    verse_counts = np.asarray(incidence.sum(axis=0)).ravel()
+
+    # Drop self co-occurrence; it only says an ID appears where it appears
+    off_diagonal = cooc.row != cooc.col
+    rows, cols, counts = cooc.row[off_diagonal], cooc.col[off_diagonal], cooc.data[off_diagonal]
+
+    row_totals = np.bincount(rows, weights=counts, minlength=len(ids))
+    context_totals = row_totals ** alpha
+    pmi = np.log(counts * context_totals.sum() / (row_totals[rows] * context_totals[cols]))
+
+    positive = pmi > 0
+    ppmi = sp.csr_matrix((pmi[positive].astype(np.float32), (rows[positive], cols[positive])),
+                         shape=(len(ids), len(ids)))
+    return np.asarray(ids, dtype=str), verse_counts.astype(np.int64), ppmi
+
+
+def build_embeddings(ppmi, dim=cfg.EMBEDDING_DIM):
+    """
+    Reduces a PPMI matrix to dense ID embeddings with truncated SVD.
+
+    Uses U * sqrt(S), L2-normalized, so a dot product between rows is the
+    cosine similarity.
+
+    :param ppmi: Sparse PPMI matrix.
+    :param dim: Number of singular vectors to keep.
+    :return: float32 array of shape (n_ids, dim).
+    """
+    u, s, _ = svds(ppmi, k=min(dim, min(ppmi.shape) - 1), random_state=0)
+    vectors = u * np.sqrt(s)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+
+def top_renderings(verse_ids):
+    """Most common English rendering of each Strong's ID across the English versions."""
+    english = verse_ids.assign(verse_part=verse_ids["verse_part"].str.lower())
+    english = english[english["verse_part"] != ""]
+    counts = english.groupby(["hebrew_id", "verse_part"]).size().reset_index(name="n")
+    counts = counts.sort_values(["hebrew_id", "n"], ascending=[True, False])
+    return counts.drop_duplicates("hebrew_id").set_index("hebrew_id")["verse_part"]
+
+
+def save_embeddings(ids, verse_counts, renderings, vectors, out_dir=EMBEDDING_DIR):
+    """
+    Writes the embedding matrix as a raw .npy (memory-mappable) and the
+    vocabulary as a CSV in matching row order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "strongs_vectors.npy"), vectors)
+    pd.DataFrame({
+        "hebrew_id": ids,
+        "verse_count": verse_counts,
+        "rendering": pd.Series(ids).map(renderings).fillna("").to_numpy()
+    }).to_csv(os.path.join(out_dir, "strongs_vocab.csv"), index=False)
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    start = time.time()
+    verse_ids = load_verse_ids()
+    ids, verse_counts, ppmi = build_ppmi_matrix(verse_ids)
+    vectors = build_embeddings(ppmi)
+    save_embeddings(ids, verse_counts, top_renderings(verse_ids), vectors)
+    print(f"✅ Built {vectors.shape[1]}-d embeddings for {len(ids):,} Strong's IDs "
+          f"({ppmi.nnz:,} PPMI entries) in {time.time() - start:.1f}s")
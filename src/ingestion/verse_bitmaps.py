@@ -0,0 +1,77 @@
+# Import required libraries
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from src.config import base as cfg  # Custom config file with paths and ES settings
+from src.utils.verse_data import DERIVED_DIR, VERSE_DATA_DIR, load_verse_data
+
+# Define the directory the per-version verse bitmap indexes are written to
+BITMAP_DIR = os.path.join(DERIVED_DIR, cfg.BITMAP_DATA_FOLDER)
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def tokenize(text):
+    """Lowercase word tokens of an English verse part (shared with the query parser)."""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def version_terms(df):
+    """
+    The distinct (verse_key, term) pairs of one Bible version, where a term
+    is either a Strong's ID or a lowercase English token.
+
+    :param df: One version's rows of load_verse_data (verse_key, verse_part, hebrew_id).
+    :return: DataFrame with verse_key and term columns.
+    """
+    ids = df[["verse_key", "hebrew_id"]].dropna().rename(columns={"hebrew_id": "term"})
+    tokens = (df[["verse_key"]].assign(term=df["verse_part"].map(tokenize))
+              .explode("term").dropna())
+    return pd.concat([ids, tokens], ignore_index=True).drop_duplicates()
+
+
+def build_posting_lists(pairs):
+    """
+    Builds compressed per-term verse sets: every verse gets a dense ordinal in
+    canonical order, and each term maps to a sorted uint32 array of ordinals
+    stored back to back (CSR layout).
+
+    :param pairs: Output of version_terms.
+    :return: Dict of arrays ready for np.savez.
+    """
+    verse_keys = np.sort(pairs["verse_key"].unique().astype(np.int64))
+    ordinals = np.searchsorted(verse_keys, pairs["verse_key"].to_numpy(dtype=np.int64)).astype(np.uint32)
+    term_codes, terms = pd.factorize(pairs["term"], sort=True)
+
+    # Sort by (term, ordinal) so every term's postings are one contiguous sorted run
+    order = np.lexsort((ordinals, term_codes))
+    postings = ordinals[order]
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(term_codes, minlength=len(terms)), out=offsets[1:])
+
+    return {"verse_keys": verse_keys, "terms": np.asarray(terms, dtype=str),
+            "offsets": offsets, "postings": postings}
+
+
+def build_all_bitmaps(folder=VERSE_DATA_DIR, out_dir=BITMAP_DIR):
+    """
+    Builds and saves a verse bitmap index for every version.
+
+    :param folder: Path to the verse_data folder with version-named subdirectories.
+    :param out_dir: Folder the index files are written to.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    verse_data = load_verse_data(folder, usecols=["version", "verse_part", "hebrew_id"])
+    for version, df in verse_data.groupby("version"):
+        start = time.time()
+        arrays = build_posting_lists(version_terms(df))
+        np.savez(os.path.join(out_dir, f"{version}.npz"), **arrays)
+        print(f"✅ Built {version} verse bitmaps: {len(arrays['terms']):,} terms over "
+              f"{len(arrays['verse_keys']):,} verses in {time.time() - start:.1f}s")
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    build_all_bitmaps()
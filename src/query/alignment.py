@@ -0,0 +1,57 @@
+import os
+import pandas as pd
+from src.config import base as cfg
+from src.utils.verse_data import DERIVED_DIR
+from src.utils.verse_keys import parse_verse_key
+
+# Define the file the precomputed alignment table is read from
+ALIGNMENT_PATH = os.path.join(DERIVED_DIR, cfg.ALIGNMENT_DATA_FOLDER, cfg.ALIGNMENT_FILE)
+
+
+class VerseAlignment:
+    """In-memory view of the cross-version alignment table with O(1) row lookups."""
+
+    def __init__(self, path=ALIGNMENT_PATH):
+        self.table = pd.read_parquet(path)
+        self.versions = [c for c in self.table.columns if c in cfg.BIBLE_VERSIONS]
+        self._rows_by_id = self.table.groupby("hebrew_id", sort=False).indices
+        self._rows_by_verse = self.table.groupby("verse_key", sort=False).indices
+
+    def _rows(self, index, key, versions):
+        rows = index.get(key)
+        columns = ["verse_key", "bible_verse", "hebrew_id"] + (versions or self.versions)
+        if rows is None:
+            return pd.DataFrame(columns=columns)
+        return self.table.iloc[rows][columns].reset_index(drop=True)
+
+    def for_id(self, strongs_id, versions=None):
+        """
+        Every version's rendering of a Strong's ID, one row per verse.
+
+        :param strongs_id: Strong's ID to look up (e.g. "H2617").
+        :param versions: Optional subset of version columns to return.
+        :return: DataFrame with verse_key, bible_verse, hebrew_id and one column
+                 per version, in canonical verse order.
+        """
+        return self._rows(self._rows_by_id, strongs_id, versions)
+
+    def for_verse(self, verse, versions=None):
+        """
+        Every version's rendering of each Strong's ID in a verse.
+
+        :param verse: Canonical verse key (e.g. 8001001), or a verse reference
+                      in any version's spelling (e.g. "Ruth1:1", "2 Samuel2Sa 1:1").
+        :param versions: Optional subset of version columns to return.
+        :return: DataFrame with verse_key, bible_verse, hebrew_id and one column per version.
+        """
+        if isinstance(verse, str):
+            verse = self._verse_key_for(verse)
+        return self._rows(self._rows_by_verse, verse, versions)
+
+    @staticmethod
+    def _verse_key_for(bible_verse):
+        """Verse key of a scraped reference string, or None if no book prefix matches."""
+        for book in sorted(cfg.BIBLE_BOOKS, key=len, reverse=True):
+            if bible_verse.startswith(book):
+                return parse_verse_key(book, bible_verse)
+        return None
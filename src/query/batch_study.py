@@ -0,0 +1,201 @@
+import os
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from src.config import base as cfg
+from src.query.explorer_queries import (
+    connect_es, normalize_term, detect_search_type,
+    build_base_query, build_study_query, parse_study_aggregations
+)
+
+SUMMARY_COLUMNS = ["term", "search_type", "version", "total_occurrences",
+                   "distinct_books", "unique_verses", "error"]
+BREAKDOWN_COLUMNS = ["term", "version", "dimension", "key", "count"]
+INTEGER_COLUMNS = {"total_occurrences", "distinct_books", "unique_verses", "count"}
+BREAKDOWN_DIMENSIONS = {"by_book": "bible_book", "by_testament": "testament_type", "by_lit": "lit_type"}
+
+
+def read_terms(path):
+    """Read one search term per line, skipping blank lines and # comments."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def plan_queries(terms, versions, search_type="auto"):
+    """
+    Expand a term list into unique (term, search_type, version) queries.
+
+    :param terms: Raw search terms (Strong's IDs and/or English words).
+    :param versions: Bible versions to run every term against.
+    :param search_type: "Strong's ID", "English word" or "auto" to detect per term.
+    :return: List of (term, search_type, version) tuples in input order.
+    """
+    planned, seen = [], set()
+    for raw in terms:
+        term_type = detect_search_type(raw) if search_type == "auto" else search_type
+        term = normalize_term(term_type, raw)
+        if term_type == "Strong's ID":
+            term = term.upper()
+        for version in versions:
+            key = (term, term_type, version)
+            if term and key not in seen:
+                seen.add(key)
+                planned.append(key)
+    return planned
+
+
+def run_msearch_batch(es, batch):
+    """
+    Run one msearch request for a batch of planned queries.
+
+    :param es: Elasticsearch client instance.
+    :param batch: List of (term, search_type, version) tuples.
+    :return: Tuple of (summary_rows, breakdown_rows).
+    """
+    searches = []
+    for term, term_type, version in batch:
+        searches.append({"index": cfg.ES_VERSE_INDEX_NAME})
+        searches.append(build_study_query(build_base_query(term_type, term, version)))
+    responses = es.msearch(searches=searches)["responses"]
+
+    summary_rows, breakdown_rows = [], []
+    for (term, term_type, version), response in zip(batch, responses):
+        if "error" in response:
+            summary_rows.append({"term": term, "search_type": term_type, "version": version,
+                                 "total_occurrences": 0, "distinct_books": 0, "unique_verses": 0,
+                                 "error": str(response["error"].get("reason", response["error"]))})
+            continue
+
+        stats = parse_study_aggregations(response)
+        summary_rows.append({"term": term, "search_type": term_type, "version": version,
+                             "total_occurrences": stats["total_occurrences"],
+                             "distinct_books": stats["distinct_books"],
+                             "unique_verses": stats["unique_verses"], "error": ""})
+        for agg_name, dimension in BREAKDOWN_DIMENSIONS.items():
+            breakdown_rows.extend(
+                {"term": term, "version": version, "dimension": dimension, "key": key, "count": count}
+                for key, count in stats[agg_name].items()
+            )
+    return summary_rows, breakdown_rows
+
+
+def iter_study_results(es, planned, batch_size=cfg.BATCH_MSEARCH_SIZE,
+                       max_concurrency=cfg.BATCH_MAX_CONCURRENCY):
+    """
+    Run planned queries as msearch batches with bounded concurrency.
+
+    At most max_concurrency batches are in flight at once and results are
+    yielded in input order as soon as they complete, so memory stays flat
+    however long the term list is.
+
+    :param es: Elasticsearch client instance.
+    :param planned: Output of plan_queries.
+    :param batch_size: Number of searches per msearch request.
+    :param max_concurrency: Maximum number of concurrent msearch requests.
+    :return: Generator of (summary_rows, breakdown_rows) per batch.
+    """
+    batches = (planned[i:i + batch_size] for i in range(0, len(planned), batch_size))
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for batch in batches:
+            if len(in_flight) >= max_concurrency:
+                yield in_flight.popleft().result()
+            in_flight.append(pool.submit(run_msearch_batch, es, batch))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+class StudyResultWriter:
+    """Incrementally writes summary and breakdown rows to CSV or Parquet files."""
+
+    def __init__(self, out_prefix, fmt="csv"):
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported output format '{fmt}'")
+        self.fmt = fmt
+        self.paths = {"summary": f"{out_prefix}_summary.{fmt}",
+                      "breakdown": f"{out_prefix}_breakdown.{fmt}"}
+        self.columns = {"summary": SUMMARY_COLUMNS, "breakdown": BREAKDOWN_COLUMNS}
+        self._parquet_writers = {}
+        self._started = set()
+        out_dir = os.path.dirname(out_prefix)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def _write_table(self, name, rows):
+        df = pd.DataFrame(rows, columns=self.columns[name])
+        if self.fmt == "csv":
+            df.to_csv(self.paths[name], mode="a" if name in self._started else "w",
+                      header=name not in self._started, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            schema = pa.schema([(c, pa.int64() if c in INTEGER_COLUMNS else pa.string())
+                                for c in self.columns[name]])
+            if name not in self._parquet_writers:
+                self._parquet_writers[name] = pq.ParquetWriter(self.paths[name], schema)
+            self._parquet_writers[name].write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+        self._started.add(name)
+
+    def write(self, summary_rows, breakdown_rows):
+        """Append one batch of results to the output files."""
+        self._write_table("summary", summary_rows)
+        if breakdown_rows or "breakdown" not in self._started:
+            self._write_table("breakdown", breakdown_rows)
+
+    def close(self):
+        """Flush and close any open Parquet writers."""
+        for writer in self._parquet_writers.values():
+            writer.close()
+        self._parquet_writers = {}
+
+
+def run_batch_study(es, terms, versions, out_prefix, fmt="csv", search_type="auto",
+                    batch_size=cfg.BATCH_MSEARCH_SIZE, max_concurrency=cfg.BATCH_MAX_CONCURRENCY):
+    """
+    Run a batch word study and stream the results to disk.
+
+    :param es: Elasticsearch client instance.
+    :param terms: Raw search terms.
+    :param versions: Bible versions to run every term against.
+    :param out_prefix: Output path prefix; _summary and _breakdown files are written.
+    :param fmt: "csv" or "parquet".
+    :param search_type: "Strong's ID", "English word" or "auto".
+    :param batch_size: Number of searches per msearch request.
+    :param max_concurrency: Maximum number of concurrent msearch requests.
+    :return: Dict with the query count, elapsed seconds and output paths.
+    """
+    planned = plan_queries(terms, versions, search_type=search_type)
+    writer = StudyResultWriter(out_prefix, fmt=fmt)
+    start = time.time()
+    try:
+        for summary_rows, breakdown_rows in iter_study_results(
+                es, planned, batch_size=batch_size, max_concurrency=max_concurrency):
+            writer.write(summary_rows, breakdown_rows)
+    finally:
+        writer.close()
+    return {"queries": len(planned), "seconds": time.time() - start, "paths": writer.paths}
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a batch word study over a list of terms.")
+    parser.add_argument("terms_file", help="Text file with one Strong's ID or English word per line")
+    parser.add_argument("--out", default="word_study", help="Output path prefix")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--versions", nargs="+", default=cfg.BIBLE_VERSIONS)
+    parser.add_argument("--search-type", choices=["auto", "Strong's ID", "English word"], default="auto")
+    parser.add_argument("--batch-size", type=int, default=cfg.BATCH_MSEARCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=cfg.BATCH_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    es = connect_es(connections_per_node=args.concurrency)
+    result = run_batch_study(
+        es, read_terms(args.terms_file), args.versions, args.out, fmt=args.format,
+        search_type=args.search_type, batch_size=args.batch_size, max_concurrency=args.concurrency
+    )
+    print(f"✅ Ran {result['queries']:,} queries in {result['seconds']:.1f}s "
+          f"({result['queries'] / max(result['seconds'], 1e-9):,.0f}/s)")
+    for path in result["paths"].values():
+        print(f"📄 {path}")
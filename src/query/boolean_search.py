@@ -0,0 +1,147 @@
+import os
+import re
+import numpy as np
+from src.config import base as cfg
+from src.utils.verse_data import DERIVED_DIR
+from src.ingestion.verse_bitmaps import tokenize
+from src.query.explorer_queries import STRONGS_ID_PATTERN
+
+# Define the directory the per-version verse bitmap indexes are read from
+BITMAP_DIR = os.path.join(DERIVED_DIR, cfg.BITMAP_DATA_FOLDER)
+
+QUERY_TOKEN_PATTERN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+OPERATORS = {"AND", "OR", "NOT"}
+
+
+class BooleanQueryError(ValueError):
+    """Raised when a boolean verse query can't be parsed."""
+
+
+def parse_boolean_query(query):
+    """
+    Parse a boolean verse query into a nested tuple tree.
+
+    Grammar (NOT binds tighter than AND, AND tighter than OR; adjacent terms
+    are ANDed):  expr := and (OR and)* ; and := not ([AND] not)* ;
+    not := NOT not | "(" expr ")" | term
+
+    Terms are Strong's IDs (H2617, g26) or English words, matched per verse.
+    Operators are case-insensitive; quote one ("or") to search the word itself.
+
+    :param query: e.g. "H2617 AND H571 NOT H7965" or "love or charity".
+    :return: ("term", term) | ("not", node) | ("and", [nodes]) | ("or", [nodes]).
+    """
+    tokens = QUERY_TOKEN_PATTERN.findall(query)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def peek_operator():
+        """The upcoming token as an operator ("AND"/"OR"/"NOT"), or None for terms and parentheses."""
+        token = peek()
+        return token.upper() if token is not None and token.upper() in OPERATORS else None
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek_operator() == "OR":
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nodes = [parse_not()]
+        while peek() not in (None, ")") and peek_operator() != "OR":
+            if peek_operator() == "AND":
+                take()
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not():
+        token = peek()
+        if token is None:
+            raise BooleanQueryError("Query ended where a term was expected")
+        if peek_operator() == "NOT":
+            take()
+            return ("not", parse_not())
+        if token == "(":
+            take()
+            node = parse_or()
+            if peek() != ")":
+                raise BooleanQueryError("Missing closing parenthesis")
+            take()
+            return node
+        if peek_operator() or token == ")":
+            raise BooleanQueryError(f"Unexpected '{token}'")
+        return ("term", normalize_query_term(take().strip('"')))
+
+    if not tokens:
+        raise BooleanQueryError("Empty query")
+    tree = parse_or()
+    if peek() is not None:
+        raise BooleanQueryError(f"Unexpected '{peek()}'")
+    return tree
+
+
+def normalize_query_term(term):
+    """Map a raw query term onto the index vocabulary (upper-case IDs, lowercase words)."""
+    if STRONGS_ID_PATTERN.match(term):
+        return term.upper()
+    words = tokenize(term)
+    return words[0] if words else term.lower()
+
+
+def positive_terms(tree, negated=False):
+    """Return the terms in a parsed query that are not under a NOT."""
+    kind, value = tree
+    if kind == "term":
+        return [] if negated else [value]
+    if kind == "not":
+        return positive_terms(value, not negated)
+    return [term for node in value for term in positive_terms(node, negated)]
+
+
+class VerseBitmapIndex:
+    """Per-term verse sets for one version, answering AND/OR/NOT with bitmap operations."""
+
+    def __init__(self, version, bitmap_dir=BITMAP_DIR):
+        self.version = version
+        with np.load(os.path.join(bitmap_dir, f"{version}.npz")) as data:
+            self.verse_keys = data["verse_keys"]
+            self.offsets = data["offsets"]
+            self.postings = data["postings"]
+            self.term_index = {term: i for i, term in enumerate(data["terms"].tolist())}
+
+    def postings_for(self, term):
+        """Sorted verse ordinals containing a term (empty if the term is unknown)."""
+        i = self.term_index.get(term)
+        if i is None:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def _bitmap(self, tree):
+        kind, value = tree
+        if kind == "term":
+            bitmap = np.zeros(len(self.verse_keys), dtype=bool)
+            bitmap[self.postings_for(value)] = True
+            return bitmap
+        if kind == "not":
+            return ~self._bitmap(value)
+        bitmaps = [self._bitmap(node) for node in value]
+        combine = np.logical_and if kind == "and" else np.logical_or
+        return combine.reduce(bitmaps)
+
+    def search(self, query):
+        """
+        Evaluate a boolean query against this version.
+
+        :param query: Query string or a tree from parse_boolean_query.
+        :return: Sorted numpy array of matching verse keys (canonical order).
+        """
+        tree = parse_boolean_query(query) if isinstance(query, str) else query
+        return self.verse_keys[self._bitmap(tree)]
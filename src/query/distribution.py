@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from src.config import base as cfg
+from src.utils.verse_keys import book_ordinal, BOOK_MULTIPLIER, CHAPTER_MULTIPLIER
+
+MAX_CHAPTERS = 150  # Psalms
+
+
+def build_chapter_distribution_query(base_query, after_key=None, page_size=cfg.COMPOSITE_PAGE_SIZE):
+    """
+    Build one page of a composite aggregation over (bible_book, bible_chapter).
+
+    :param base_query: Query returned by build_base_query.
+    :param after_key: after_key of the previous page, if any.
+    :param page_size: Number of (book, chapter) buckets per page.
+    :return: Search body with size 0.
+    """
+    composite = {
+        "size": page_size,
+        "sources": [
+            {"book": {"terms": {"field": "bible_book"}}},
+            {"chapter": {"terms": {"field": "bible_chapter"}}}
+        ]
+    }
+    if after_key:
+        composite["after"] = after_key
+    return {"size": 0, "query": base_query, "aggs": {"by_chapter": {"composite": composite}}}
+
+
+def fetch_chapter_counts(es, base_query, page_size=cfg.COMPOSITE_PAGE_SIZE):
+    """
+    Count matching verse parts per (book, chapter), following after_key until
+    every bucket is read (at most ~1,189 chapters, so one or two pages).
+
+    :param es: Elasticsearch client instance.
+    :param base_query: Query returned by build_base_query.
+    :param page_size: Number of buckets per page.
+    :return: List of (bible_book, bible_chapter, count) tuples.
+    """
+    counts, after_key = [], None
+    while True:
+        res = es.search(index=cfg.ES_VERSE_INDEX_NAME,
+                        body=build_chapter_distribution_query(base_query, after_key, page_size))
+        agg = res["aggregations"]["by_chapter"]
+        counts.extend((b["key"]["book"], b["key"]["chapter"], b["doc_count"]) for b in agg["buckets"])
+        after_key = agg.get("after_key")
+        if not agg["buckets"] or after_key is None:
+            return counts
+
+
+def chapter_matrix(book_ordinals, chapters, weights=None):
+    """
+    Scatter (book, chapter) observations into a dense book x chapter matrix
+    with a single np.bincount.
+
+    :param book_ordinals: Array of canonical 1-based book ordinals.
+    :param chapters: Array of chapter numbers.
+    :param weights: Optional counts per observation (defaults to 1 each).
+    :return: DataFrame indexed by book name (canonical order, books with
+             at least one hit) with one column per chapter.
+    """
+    book_ordinals = np.asarray(book_ordinals, dtype=np.int64)
+    chapters = np.asarray(chapters, dtype=np.int64)
+    valid = (chapters >= 1) & (chapters <= MAX_CHAPTERS)
+    book_ordinals, chapters = book_ordinals[valid], chapters[valid]
+    if weights is not None:
+        weights = np.asarray(weights)[valid]
+    width = MAX_CHAPTERS + 1
+    flat = np.bincount(book_ordinals * width + chapters, weights=weights,
+                       minlength=(len(cfg.BIBLE_BOOKS) + 1) * width)
+    matrix = flat.reshape(len(cfg.BIBLE_BOOKS) + 1, width)[1:, 1:]
+
+    books = matrix.sum(axis=1) > 0
+    last_chapter = int(np.flatnonzero(matrix.sum(axis=0))[-1]) + 1 if matrix.any() else 0
+    return pd.DataFrame(matrix[books, :last_chapter].astype(np.int64),
+                        index=np.asarray(cfg.BIBLE_BOOKS)[books],
+                        columns=range(1, last_chapter + 1))
+
+
+def chapter_matrix_from_counts(counts):
+    """Book x chapter matrix from fetch_chapter_counts output."""
+    if not counts:
+        return chapter_matrix([], [])
+    books, chapters, weights = zip(*counts)
+    ordinals = [book_ordinal(book) or 0 for book in books]  # Unknown books land in the dropped row 0
+    return chapter_matrix(ordinals, chapters, weights=np.asarray(weights, dtype=np.float64))
+
+
+def chapter_matrix_from_verse_keys(verse_keys):
+    """Book x chapter matrix counting verses, computed locally from canonical verse keys."""
+    verse_keys = np.asarray(verse_keys, dtype=np.int64)
+    return chapter_matrix(verse_keys // BOOK_MULTIPLIER, verse_keys % BOOK_MULTIPLIER // CHAPTER_MULTIPLIER)
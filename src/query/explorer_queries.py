@@ -0,0 +1,172 @@
+import os
+import re
+import streamlit as st
+from elasticsearch import Elasticsearch
+from src.config import base as cfg
+
+STRONGS_ID_PATTERN = re.compile(r"^[HG]\d+[a-z]?$", re.IGNORECASE)
+
+
+def connect_es(**kwargs):
+    """
+    Create an Elasticsearch client from the ES_HOST / ES_API_KEY environment
+    variables, falling back to the Streamlit secrets.
+
+    :param kwargs: Extra keyword arguments passed through to Elasticsearch.
+    :return: Elasticsearch client instance.
+    """
+    return Elasticsearch(
+        hosts=os.environ.get("ES_HOST") or st.secrets["ES_HOST"],
+        api_key=os.environ.get("ES_API_KEY") or st.secrets["ES_API_KEY"],
+        verify_certs=True,
+        request_timeout=cfg.ES_TIMEOUT,
+        **kwargs
+    )
+
+
+def normalize_term(search_type, search_input):
+    """Clean a search term the same way the explorer sidebar does."""
+    if search_type == "English word":
+        return search_input.lower().strip()
+    if search_type == "Strong's ID":
+        return search_input.strip().upper()  # IDs are indexed as "H430", so "h430" must match too
+    return search_input.strip()
+
+
+def detect_search_type(term):
+    """Guess whether a raw term is a Strong's ID (e.g. G26, H2617) or an English word."""
+    return "Strong's ID" if STRONGS_ID_PATTERN.match(term.strip()) else "English word"
+
+
+def build_english_clause(search_input, subfields=True):
+    """
+    Match verse parts by their English text.
+
+    A single word is an exact lookup on the normalized verse_part.lower keyword
+    (the part is rendered as that word, ignoring case and punctuation); a phrase
+    is a match_phrase on the verse_part.shingles subfield.
+
+    :param search_input: Normalized English word or phrase.
+    :param subfields: Use the tuned mapping's subfields; False gives the plain
+                      match_phrase on verse_part the baseline mapping supports.
+    :return: Elasticsearch query clause.
+    """
+    if not subfields:
+        return {"match_phrase": {"verse_part": search_input}}
+    if len(search_input.split()) == 1:
+        return {"term": {"verse_part.lower": search_input}}
+    return {"match_phrase": {"verse_part.shingles": search_input}}
+
+
+def build_base_query(search_type, search_input, version=None, verse_range=None, subfields=True):
+    """
+    Build the bool query every explorer panel is filtered by.
+
+    :param search_type: "Strong's ID" or "English word".
+    :param search_input: Normalized search term.
+    :param version: Optional Bible version to filter on.
+    :param verse_range: Optional inclusive (low, high) verse key bounds,
+                        e.g. from verse_keys.passage_range.
+    :param subfields: Passed on to build_english_clause.
+    :return: Elasticsearch bool query.
+    """
+    if search_type == "Strong's ID":
+        must_clause = [{"term": {"hebrew_id": search_input}}]
+    else:
+        must_clause = [build_english_clause(search_input, subfields)]
+    base_query = {"bool": {"must": must_clause, "filter": []}}
+    if version:
+        base_query["bool"]["filter"].append({"term": {"version": version}})
+    if verse_range:
+        base_query["bool"]["filter"].append({"range": {"verse_key": {"gte": verse_range[0], "lte": verse_range[1]}}})
+    return base_query
+
+
+def build_verse_set_query(verse_keys, terms, version=None):
+    """
+    Build a bool query over an explicit set of verses, e.g. the result of a
+    boolean bitmap search, so the summary and verse panels can run on it.
+
+    Verse parts matching one of the positive terms are what gets counted; a
+    purely negative search (no terms) counts every part of the verses.
+
+    :param verse_keys: Canonical integer keys of the verses to include.
+    :param terms: Strong's IDs and/or English words to count within those verses.
+    :param version: Optional Bible version to filter on.
+    :return: Elasticsearch bool query.
+    """
+    should_clause = [{"term": {"hebrew_id": term}} if STRONGS_ID_PATTERN.match(term)
+                     else {"match": {"verse_part": term}} for term in terms]
+    base_query = {"bool": {
+        "filter": [{"terms": {"verse_key": [int(key) for key in verse_keys]}}],
+        "should": should_clause,
+        "minimum_should_match": 1 if should_clause else 0
+    }}
+    if version:
+        base_query["bool"]["filter"].append({"term": {"version": version}})
+    return base_query
+
+
+def build_context_query(verse_key, version, radius):
+    """
+    Fetch every part of the verses within +/- radius of a verse in the same
+    chapter, in canonical order, with a single numeric range query.
+
+    :param verse_key: Canonical integer key of the centre verse.
+    :param version: Bible version to fetch.
+    :param radius: Number of surrounding verses on each side.
+    :return: Search body.
+    """
+    return {
+        "size": 10_000,
+        "query": {"bool": {"filter": [
+            {"term": {"version": version}},
+            {"range": {"verse_key": {"gte": verse_key - radius, "lte": verse_key + radius}}}
+        ]}},
+        "sort": [{"verse_key": "asc"}, "_doc"],
+        "_source": ["verse_key", "bible_verse", "verse_part"]
+    }
+
+
+def build_study_query(base_query):
+    """
+    Build a single search body computing the summary, by-book, testament and
+    literary type statistics for a query.
+
+    :param base_query: Query returned by build_base_query.
+    :return: Search body with size 0 and all study aggregations.
+    """
+    return {
+        "size": 0,
+        "query": base_query,
+        "aggs": {
+            "total_occurrences": {"value_count": {"field": "verse_part.keyword"}},
+            "distinct_books": {"cardinality": {"field": "bible_book"}},
+            "unique_verses": {"cardinality": {"field": "bible_verse"}},
+            "by_book": {"terms": {"field": "bible_book", "size": 100, "order": {"_key": "asc"}}},
+            "by_testament": {"terms": {"field": "testament_type", "size": 10}},
+            "by_lit": {"terms": {"field": "lit_type", "size": 10}}
+        }
+    }
+
+
+def parse_study_aggregations(response):
+    """
+    Flatten the aggregations of a build_study_query response.
+
+    :param response: Search response (or a single msearch response item).
+    :return: Dict with summary counts and {key: count} dicts per breakdown.
+    """
+    aggs = response.get("aggregations", {})
+
+    def buckets(name):
+        return {b["key"]: b["doc_count"] for b in aggs.get(name, {}).get("buckets", [])}
+
+    return {
+        "total_occurrences": int(aggs.get("total_occurrences", {}).get("value", 0)),
+        "distinct_books": int(aggs.get("distinct_books", {}).get("value", 0)),
+        "unique_verses": int(aggs.get("unique_verses", {}).get("value", 0)),
+        "by_book": buckets("by_book"),
+        "by_testament": buckets("by_testament"),
+        "by_lit": buckets("by_lit")
+    }
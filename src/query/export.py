@@ -0,0 +1,197 @@
+import os
+import csv
+import json
+import time
+import weakref
+import argparse
+import tempfile
+from src.config import base as cfg
+from src.query.explorer_queries import connect_es, normalize_term, detect_search_type, build_base_query
+
+EXPORT_FIELDS = ["version", "bible_book", "bible_chapter", "bible_verse", "verse_key",
+                 "verse_part_type", "verse_part", "hebrew_id", "lit_type", "testament_type"]
+INTEGER_FIELDS = {"bible_chapter", "verse_key"}
+EXPORT_FORMATS = ["csv", "jsonl", "parquet"]
+
+
+def iter_occurrence_pages(es, query, page_size=cfg.EXPORT_PAGE_SIZE, keep_alive=cfg.EXPORT_KEEP_ALIVE):
+    """
+    Stream every verse part matching a query, one page at a time.
+
+    Uses a point-in-time so the export sees a consistent snapshot, and
+    search_after on (verse_key, _shard_doc) so memory stays constant no
+    matter how many hits there are.
+
+    :param es: Elasticsearch client instance.
+    :param query: Query to export, e.g. from build_base_query.
+    :param page_size: Number of hits per page.
+    :param keep_alive: How long the point-in-time is kept open between pages.
+    :return: Generator of lists of _source dicts in canonical verse order.
+    """
+    pit_id = es.open_point_in_time(index=cfg.ES_VERSE_INDEX_NAME, keep_alive=keep_alive)["id"]
+    search_after = None
+    try:
+        while True:
+            page = es.search(
+                pit={"id": pit_id, "keep_alive": keep_alive},
+                query=query,
+                size=page_size,
+                sort=[{"verse_key": {"order": "asc", "missing": "_last"}}, {"_shard_doc": "asc"}],
+                source=EXPORT_FIELDS,
+                track_total_hits=False,
+                search_after=search_after
+            )
+            hits = page["hits"]["hits"]
+            if not hits:
+                break
+            pit_id = page.get("pit_id", pit_id)
+            search_after = hits[-1]["sort"]
+            yield [hit["_source"] for hit in hits]
+    finally:
+        es.close_point_in_time(id=pit_id)
+
+
+def _clean_row(source):
+    """Give every exported row the same fields, with integers (or None) in integer fields."""
+    row = {}
+    for field in EXPORT_FIELDS:
+        value = source.get(field)
+        if field in INTEGER_FIELDS:
+            value = value if isinstance(value, int) else None
+        row[field] = value
+    return row
+
+
+class OccurrenceWriter:
+    """Appends pages of verse parts to a CSV, JSONL or Parquet file without buffering them."""
+
+    def __init__(self, path, fmt="csv"):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        self.fmt = fmt
+        self.rows_written = 0
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._pa = pa
+            self._schema = pa.schema([(f, pa.int64() if f in INTEGER_FIELDS else pa.string()) for f in EXPORT_FIELDS])
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+            if fmt == "csv":
+                self._writer = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+                self._writer.writeheader()
+
+    def write_page(self, sources):
+        """Write one page of _source dicts."""
+        rows = [_clean_row(source) for source in sources]
+        if self.fmt == "csv":
+            self._writer.writerows(rows)
+        elif self.fmt == "jsonl":
+            self._file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        else:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+        self.rows_written += len(rows)
+
+    def close(self):
+        """Flush and close the output file."""
+        if self.fmt == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+
+def count_occurrences(es, query):
+    """Number of verse parts an export of a query would write, without fetching them."""
+    return es.count(index=cfg.ES_VERSE_INDEX_NAME, query=query)["count"]
+
+
+def export_occurrences(es, query, path, fmt="csv", page_size=cfg.EXPORT_PAGE_SIZE):
+    """
+    Export every verse part matching a query to a file.
+
+    :param es: Elasticsearch client instance.
+    :param query: Query to export.
+    :param path: Output file path.
+    :param fmt: "csv", "jsonl" or "parquet".
+    :param page_size: Number of hits fetched per page.
+    :return: Number of rows written.
+    """
+    writer = OccurrenceWriter(path, fmt=fmt)
+    try:
+        for page in iter_occurrence_pages(es, query, page_size=page_size):
+            writer.write_page(page)
+    finally:
+        writer.close()
+    return writer.rows_written
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class TemporaryExport:
+    """
+    An export file in the temp directory that is deleted when discarded,
+    when the object is garbage collected (e.g. with the session state that
+    held it) or at interpreter exit, whichever comes first.
+    """
+
+    def __init__(self, fmt="csv"):
+        fd, self.path = tempfile.mkstemp(prefix="occurrences_", suffix=f".{fmt}")
+        os.close(fd)
+        self.fmt = fmt
+        self.rows = 0
+        self._data = None
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+    @property
+    def data(self):
+        """The file's bytes, read once (a download button resends them on every rerun)."""
+        if self._data is None:
+            with open(self.path, "rb") as f:
+                self._data = f.read()
+        return self._data
+
+    def discard(self):
+        """Delete the export file now and drop its bytes."""
+        self._data = None
+        self._finalizer()
+
+
+def build_export_query(search_type, search_input, versions, verse_range=None):
+    """
+    Build the export query for a term across one or more versions.
+
+    :param search_type: "Strong's ID" or "English word".
+    :param search_input: Normalized search term.
+    :param versions: Bible versions to include.
+    :param verse_range: Optional inclusive (low, high) verse key bounds.
+    :return: Elasticsearch bool query.
+    """
+    query = build_base_query(search_type, search_input, verse_range=verse_range)
+    if set(versions) != set(cfg.BIBLE_VERSIONS):
+        query["bool"]["filter"].append({"terms": {"version": list(versions)}})
+    return query
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export every occurrence of a term.")
+    parser.add_argument("term", help="Strong's ID or English word")
+    parser.add_argument("--out", required=True, help="Output file path")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--versions", nargs="+", default=cfg.BIBLE_VERSIONS)
+    parser.add_argument("--search-type", choices=["auto", "Strong's ID", "English word"], default="auto")
+    parser.add_argument("--page-size", type=int, default=cfg.EXPORT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    search_type = detect_search_type(args.term) if args.search_type == "auto" else args.search_type
+    query = build_export_query(search_type, normalize_term(search_type, args.term), args.versions)
+
+    start = time.time()
+    rows = export_occurrences(connect_es(), query, args.out, fmt=args.format, page_size=args.page_size)
+    print(f"✅ Exported {rows:,} verse parts to {args.out} in {time.time() - start:.1f}s")
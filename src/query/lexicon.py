@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pandas as pd
+from src.config import base as cfg
+from src.utils.verse_data import DERIVED_DIR
+from src.ingestion.lexicon_index import fold_words, trigrams
+from src.query.explorer_queries import STRONGS_ID_PATTERN
+
+# Define the directory the lexicon trigram index is read from
+LEXICON_DIR = os.path.join(DERIVED_DIR, cfg.LEXICON_DATA_FOLDER)
+
+
+class LexiconIndex:
+    """Fuzzy, diacritic-insensitive lookup of Strong's entries by original word, transliteration or gloss."""
+
+    def __init__(self, lexicon_dir=LEXICON_DIR):
+        self.entries = pd.read_csv(os.path.join(lexicon_dir, "lexicon.csv"), dtype=str, keep_default_na=False)
+        self.id_index = {strongs_id: i for i, strongs_id in enumerate(self.entries["strongs_id"])}
+        with np.load(os.path.join(lexicon_dir, "lexicon_trigrams.npz")) as data:
+            self.words = data["words"]
+            self.word_gram_counts = data["word_gram_counts"]
+            self.gram_offsets = data["gram_offsets"]
+            self.gram_postings = data["gram_postings"]
+            self.word_offsets = data["word_offsets"]
+            self.word_postings = data["word_postings"]
+            self.gram_index = {gram: i for i, gram in enumerate(data["grams"].tolist())}
+
+    @staticmethod
+    def _ranges(offsets, rows):
+        """Indices covering the CSR slices of the given rows, plus the row each index came from."""
+        starts, ends = offsets[rows], offsets[rows + 1]
+        lengths = ends - starts
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(starts, lengths) + within, np.repeat(np.arange(len(rows)), lengths)
+
+    def word_similarity(self, word):
+        """
+        Trigram (Dice) similarity of a folded query word to every indexed word.
+
+        :param word: Folded query word.
+        :return: float array with one similarity per indexed word.
+        """
+        grams = [self.gram_index[g] for g in trigrams(word) if g in self.gram_index]
+        if not grams:
+            return np.zeros(len(self.words))
+        positions, _ = self._ranges(self.gram_offsets, np.asarray(grams))
+        shared = np.bincount(self.gram_postings[positions], minlength=len(self.words))
+        return 2 * shared / (len(trigrams(word)) + self.word_gram_counts)
+
+    def search(self, query, top_k=cfg.LEXICON_TOP_K, min_similarity=cfg.LEXICON_MIN_SIMILARITY):
+        """
+        Look up lexicon entries matching a query.
+
+        Every query word is matched against the folded words of the original
+        word, transliteration and KJV/NASB glosses; an entry scores the mean
+        over query words of its best matching word.
+
+        :param query: e.g. "chesed", "חסד", "agape", "lovingkindness" or a Strong's ID.
+        :param top_k: Maximum number of entries to return.
+        :param min_similarity: Minimum word similarity (0-1) to count as a match.
+        :return: DataFrame of lexicon entries with a score column, best first.
+        """
+        query = query.strip()
+        if STRONGS_ID_PATTERN.match(query) and query.upper() in self.id_index:
+            return self.entries.iloc[[self.id_index[query.upper()]]].assign(score=1.0).reset_index(drop=True)
+
+        query_words = fold_words(query)
+        if not query_words:
+            return self.entries.iloc[:0].assign(score=[])
+        scores = np.zeros(len(self.entries))
+        for word in query_words:
+            similarity = self.word_similarity(word)
+            matches = np.flatnonzero(similarity >= min_similarity)
+            positions, rows = self._ranges(self.word_offsets, matches)
+            entry_best = np.zeros(len(self.entries))
+            np.maximum.at(entry_best, self.word_postings[positions], similarity[matches][rows])
+            scores += entry_best
+        scores /= len(query_words)
+
+        candidates = np.flatnonzero(scores)
+        k = min(top_k, len(candidates))
+        best = candidates[np.argpartition(-scores[candidates], k - 1)[:k]] if k else candidates
+        best = best[np.lexsort((best, -scores[best]))]  # Score descending, then lexicon order
+        return self.entries.iloc[best].assign(score=scores[best]).reset_index(drop=True)
@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from src.config import base as cfg
+from src.utils.verse_data import DERIVED_DIR
+
+# Define the directory the precomputed networks are read from
+NETWORK_DIR = os.path.join(DERIVED_DIR, cfg.NETWORK_DATA_FOLDER)
+
+
+class CooccurrenceNetwork:
+    """Precomputed Strong's ID co-occurrence network for a single Bible version."""
+
+    def __init__(self, version, network_dir=NETWORK_DIR):
+        self.version = version
+        self.adjacency = sp.load_npz(os.path.join(network_dir, f"{version}_edges.npz")).tocsr()
+        nodes = pd.read_csv(os.path.join(network_dir, f"{version}_nodes.csv"))
+        self.ids = nodes["hebrew_id"].to_numpy()
+        self.verse_counts = nodes["verse_count"].to_numpy()
+        self.id_index = {strongs_id: i for i, strongs_id in enumerate(self.ids)}
+
+    def _top_neighbours(self, row, top_k):
+        """Return the column indices and weights of the top_k heaviest edges in a row."""
+        start, end = self.adjacency.indptr[row], self.adjacency.indptr[row + 1]
+        neighbours = self.adjacency.indices[start:end]
+        weights = self.adjacency.data[start:end]
+        if len(weights) > top_k:
+            keep = np.argpartition(-weights, top_k - 1)[:top_k]
+            neighbours, weights = neighbours[keep], weights[keep]
+        order = np.argsort(-weights, kind="stable")
+        return neighbours[order], weights[order]
+
+    def ego_network(self, strongs_id, top_k=cfg.NETWORK_TOP_K):
+        """
+        Extract the pruned ego-network around a Strong's ID.
+
+        Keeps the top_k strongest edges to the searched ID, plus the top_k
+        strongest edges among those neighbours.
+
+        :param strongs_id: Strong's ID at the centre of the network.
+        :param top_k: Maximum number of edges kept per edge group.
+        :return: Tuple of (nodes, edges) where nodes is a list of
+                 (hebrew_id, verse_count) and edges a list of (source, target, weight).
+        """
+        row = self.id_index.get(strongs_id)
+        if row is None:
+            return [], []
+
+        neighbours, weights = self._top_neighbours(row, top_k)
+        edges = [(strongs_id, self.ids[j], int(w)) for j, w in zip(neighbours, weights)]
+
+        # Edges among the neighbours themselves, pruned to the strongest top_k
+        among = sp.triu(self.adjacency[neighbours][:, neighbours], k=1).tocoo()
+        if among.nnz > top_k:
+            keep = np.argpartition(-among.data, top_k - 1)[:top_k]
+            among = sp.coo_matrix((among.data[keep], (among.row[keep], among.col[keep])), shape=among.shape)
+        edges += [(self.ids[neighbours[i]], self.ids[neighbours[j]], int(w))
+                  for i, j, w in zip(among.row, among.col, among.data)]
+
+        members = np.concatenate(([row], neighbours))
+        nodes = [(self.ids[i], int(self.verse_counts[i])) for i in members]
+        return nodes, edges
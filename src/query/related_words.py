@@ -0,0 +1,72 @@
+import os
+import numpy as np
+import pandas as pd
+from src.config import base as cfg
+from src.utils.verse_data import DERIVED_DIR
+
+# Define the directory the precomputed embeddings are read from
+EMBEDDING_DIR = os.path.join(DERIVED_DIR, cfg.EMBEDDING_DATA_FOLDER)
+
+
+class RelatedWords:
+    """Nearest-neighbour lookups over memory-mapped PPMI/SVD Strong's ID embeddings."""
+
+    def __init__(self, embedding_dir=EMBEDDING_DIR):
+        self.vectors = np.load(os.path.join(embedding_dir, "strongs_vectors.npy"), mmap_mode="r")
+        self.vocab = pd.read_csv(os.path.join(embedding_dir, "strongs_vocab.csv"), keep_default_na=False)
+        self.id_index = {strongs_id: i for i, strongs_id in enumerate(self.vocab["hebrew_id"])}
+
+    def query_vector(self, strongs_ids, weights=None):
+        """
+        Weighted centroid of the embeddings of one or more Strong's IDs.
+
+        :param strongs_ids: Strong's IDs to combine (unknown IDs are skipped).
+        :param weights: Optional weight per ID, e.g. occurrence counts.
+        :return: Normalized float32 vector, or None if no ID is known.
+        """
+        weights = np.ones(len(strongs_ids)) if weights is None else np.asarray(weights, dtype=np.float64)
+        rows = [(self.id_index[s], w) for s, w in zip(strongs_ids, weights) if s in self.id_index]
+        if not rows:
+            return None
+        indices, row_weights = zip(*rows)
+        vector = np.asarray(row_weights, dtype=np.float32) @ self.vectors[list(indices)]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def most_similar_batch(self, query_vectors, top_k=cfg.RELATED_WORDS_TOP_K, exclude=None):
+        """
+        Top-k neighbours for several query vectors with one matrix product.
+
+        :param query_vectors: Array of shape (n_queries, dim).
+        :param top_k: Number of neighbours per query.
+        :param exclude: Optional list (per query) of Strong's IDs to leave out.
+        :return: List of DataFrames with hebrew_id, rendering, verse_count and similarity.
+        """
+        scores = np.asarray(query_vectors, dtype=np.float32) @ self.vectors.T
+        results = []
+        for q, row in enumerate(scores):
+            for strongs_id in (exclude[q] if exclude else []):
+                if strongs_id in self.id_index:
+                    row[self.id_index[strongs_id]] = -np.inf
+            k = min(top_k, len(row))
+            best = np.argpartition(-row, k - 1)[:k]
+            best = best[np.argsort(-row[best])]
+            results.append(self.vocab.iloc[best].assign(similarity=row[best]).reset_index(drop=True))
+        return results
+
+    def most_similar(self, strongs_ids, weights=None, top_k=cfg.RELATED_WORDS_TOP_K):
+        """
+        Strong's IDs most related to one ID, or to a weighted set of IDs.
+
+        :param strongs_ids: A Strong's ID or a list of them.
+        :param weights: Optional weight per ID.
+        :param top_k: Number of neighbours to return.
+        :return: DataFrame with hebrew_id, rendering, verse_count and similarity
+                 (empty if none of the IDs are in the vocabulary).
+        """
+        if isinstance(strongs_ids, str):
+            strongs_ids = [strongs_ids]
+        vector = self.query_vector(strongs_ids, weights)
+        if vector is None:
+            return pd.DataFrame(columns=["hebrew_id", "verse_count", "rendering", "similarity"])
+        return self.most_similar_batch(vector[None, :], top_k=top_k, exclude=[strongs_ids])[0]
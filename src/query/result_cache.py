@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import uuid
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from src.config import base as cfg
+from src.utils.verse_data import DERIVED_DIR
+
+# Define the file the ingestion pipeline publishes the index generation to
+GENERATION_PATH = os.path.join(DERIVED_DIR, cfg.INDEX_GENERATION_FILE)
+
+
+def publish_index_generation(path=GENERATION_PATH):
+    """
+    Mark the indices as rebuilt so every result cache drops its entries.
+
+    Called by the ingestion pipeline once all indices are loaded.
+
+    :param path: Path of the generation marker file.
+    :return: The newly published generation id.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    generation = uuid.uuid4().hex
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"generation": generation, "published_at": time.time()}, f)
+    os.replace(tmp_path, path)  # Atomic, so readers never see a half-written file
+    return generation
+
+
+def read_index_generation(path=GENERATION_PATH):
+    """Return the currently published index generation, or "" if none was published."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get("generation", "")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return ""
+
+
+def make_cache_key(panel, search_type, search_input, version, *extra):
+    """
+    Build a cache key from a panel name and the normalized query.
+
+    :param panel: Name of the panel/result being cached (e.g. "study").
+    :param search_type: "Strong's ID" or "English word".
+    :param search_input: Normalized search term.
+    :param version: Bible version filter.
+    :param extra: Any further parameters that change the result.
+    :return: Stable string key.
+    """
+    return json.dumps([panel, search_type, search_input, version, *extra], separators=(",", ":"))
+
+
+class QueryResultCache:
+    """
+    Thread-safe LRU + TTL cache for query results, shared by every session
+    in a process and optionally by every process through a SQLite file.
+
+    Entries are dropped automatically when the ingestion pipeline publishes
+    a new index generation. Each entry carries its own expiry time, so
+    results stored inside no_expiry() (the warmup job) outlive the TTL.
+    """
+
+    def __init__(self, max_entries=cfg.CACHE_MAX_ENTRIES, ttl=cfg.CACHE_TTL_SECONDS,
+                 disk_path=None, generation_path=GENERATION_PATH,
+                 generation_check_seconds=cfg.CACHE_GENERATION_CHECK_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.generation_path = generation_path
+        self.generation_check_seconds = generation_check_seconds
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+        self._generation = read_index_generation(generation_path)
+        self._generation_checked_at = time.monotonic()
+        self._disk_writes = 0
+        self._local = threading.local()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        if disk_path:
+            self._init_disk()
+
+    # --- Disk tier ---
+    def _connect(self):
+        return sqlite3.connect(self.disk_path, timeout=cfg.ES_TIMEOUT)
+
+    def _init_disk(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.disk_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+            if columns and "expires_at" not in columns:
+                conn.execute("DROP TABLE results")  # Written before per-entry expiry; it's only a cache
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, generation TEXT, expires_at REAL, accessed_at REAL, value BLOB)"
+            )
+
+    def _disk_get(self, key, generation):
+        with self._connect() as conn:
+            row = conn.execute("SELECT generation, expires_at, value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            row_generation, expires_at, value = row
+            if row_generation != generation or self._expired(expires_at):
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return expires_at, pickle.loads(value)
+
+    def _disk_set(self, key, generation, expires_at, value, prune):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                         (key, generation, expires_at, time.time(), blob))
+            if prune:
+                self._disk_prune(conn, generation)
+
+    def _disk_prune(self, conn, generation):
+        """Drop rows of older generations and, past max_entries, the least recently used rows."""
+        conn.execute("DELETE FROM results WHERE generation != ?", (generation,))
+        (rows,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if rows > self.max_entries:
+            conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed_at LIMIT ?)",
+                (rows - self.max_entries,)
+            )
+
+    # --- Generation handling ---
+    def _check_generation(self):
+        """Clear the cache if a new index generation was published (checked at most every few seconds)."""
+        now = time.monotonic()
+        if now - self._generation_checked_at < self.generation_check_seconds:
+            return
+        self._generation_checked_at = now
+        generation = read_index_generation(self.generation_path)
+        if generation != self._generation:
+            self._generation = generation
+            self.metrics["invalidations"] += 1
+            self._entries.clear()
+
+    @staticmethod
+    def _expired(expires_at):
+        return expires_at is not None and time.time() > expires_at
+
+    # --- Public API ---
+    def get(self, key):
+        """
+        Look up a cached result.
+
+        :param key: Key built with make_cache_key.
+        :return: Tuple of (hit, value).
+        """
+        with self._lock:
+            self._check_generation()
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                self.metrics["expirations"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.metrics["hits"] += 1
+                return True, entry[1]
+            if not self.disk_path:
+                self.metrics["misses"] += 1
+                return False, None
+            generation = self._generation
+
+        # SQLite I/O runs outside the lock so other sessions' memory hits never wait on disk
+        entry = self._disk_get(key, generation)
+        with self._lock:
+            if entry is None:
+                self.metrics["misses"] += 1
+                return False, None
+            if generation == self._generation:
+                self._store(key, entry)
+            self.metrics["hits"] += 1
+            return True, entry[1]
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def set(self, key, value):
+        """Store a result under a key (without expiry inside no_expiry()), evicting the least recently used entries if full."""
+        expires_at = None if getattr(self._local, "no_expiry", False) else time.time() + self.ttl
+        with self._lock:
+            self._check_generation()
+            self._store(key, (expires_at, value))
+            generation = self._generation
+            self._disk_writes += 1
+            prune = self._disk_writes % cfg.CACHE_DISK_PRUNE_EVERY == 0
+        if self.disk_path:
+            self._disk_set(key, generation, expires_at, value, prune)
+
+    @contextmanager
+    def no_expiry(self):
+        """
+        Store every result this thread computes inside the block without a TTL.
+
+        Such entries live until they are evicted or a new index generation is
+        published. Results already cached are stored again without expiry.
+        """
+        self._local.no_expiry = True
+        try:
+            yield
+        finally:
+            self._local.no_expiry = False
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached result for key, computing and storing it on a miss.
+
+        :param key: Key built with make_cache_key.
+        :param compute: Zero-argument callable producing the result.
+        :return: Cached or freshly computed result.
+        """
+        hit, value = self.get(key)
+        if not hit:
+            value = compute()
+            self.set(key, value)
+        elif getattr(self._local, "no_expiry", False):
+            self.set(key, value)  # Drop the expiry of a result cached before warmup
+        return value
+
+    def clear(self):
+        """Drop every in-memory entry (disk entries are left to expiry/generation invalidation)."""
+        with self._lock:
+            self._entries.clear()
+
+    def disk_usage(self):
+        """Bytes used by the SQLite tier (database plus write-ahead log), or 0 without one."""
+        if not self.disk_path:
+            return 0
+        return sum(os.path.getsize(path) for path in (self.disk_path, f"{self.disk_path}-wal")
+                   if os.path.exists(path))
+
+    def memory_usage(self):
+        """Approximate bytes held by the in-memory entries (their pickled size; O(entries), so not for every request)."""
+        with self._lock:
+            return sum(len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) + len(key)
+                       for key, (_, value) in self._entries.items())
+
+    def stats(self):
+        """Return hit/miss metrics plus the current entry count and hit rate."""
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["misses"]
+            return {**self.metrics, "entries": len(self._entries),
+                    "hit_rate": self.metrics["hits"] / lookups if lookups else 0.0,
+                    "generation": self._generation}
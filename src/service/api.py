@@ -0,0 +1,223 @@
+import json
+import argparse
+from contextlib import asynccontextmanager
+from typing import Optional
+import uvicorn
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from src.config import base as cfg
+from src.query.explorer_queries import connect_es, detect_search_type
+from src.service.explorer_service import ExplorerService, SEARCH_TYPE_SLUGS
+from src.utils.verse_keys import passage_range, BOOK_MULTIPLIER
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Created inside each worker process after it starts, so every worker
+    # gets its own client and connection pool instead of sharing forked sockets
+    app.state.service = ExplorerService(es=connect_es(connections_per_node=cfg.API_ES_CONNECTIONS_PER_NODE))
+    yield
+    app.state.service.es.close()
+
+
+app = FastAPI(title="Bible Word Explorer API", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=cfg.API_GZIP_MIN_BYTES)
+
+
+def get_service(request: Request):
+    return request.app.state.service
+
+
+def resolve_query(request: Request, q: str, type: str = "auto", version: str = cfg.BIBLE_VERSIONS[0],
+                  from_book: Optional[str] = None, from_chapter: Optional[int] = None,
+                  to_book: Optional[str] = None, to_chapter: Optional[int] = None,
+                  verse_low: Optional[int] = None, verse_high: Optional[int] = None):
+    """
+    Resolve the query-string parameters shared by every search endpoint.
+
+    :param q: Strong's ID, English word or boolean expression.
+    :param type: "id", "word", "boolean" or "auto" (ID or word, detected from q).
+    :param version: Bible version to search.
+    :param from_book: Optional first book of a passage to limit the search to.
+    :param from_chapter: Optional first chapter of that passage.
+    :param to_book: Optional last book of the passage (defaults to from_book).
+    :param to_chapter: Optional last chapter of the passage.
+    :param verse_low: Optional inclusive lower verse key bound (instead of the book/chapter form).
+    :param verse_high: Optional inclusive upper verse key bound.
+    :return: ExplorerQuery.
+    """
+    if type != "auto" and type not in SEARCH_TYPE_SLUGS:
+        raise HTTPException(400, f"Unknown search type '{type}'")
+    search_type = detect_search_type(q) if type == "auto" else SEARCH_TYPE_SLUGS[type]
+    if version not in cfg.BIBLE_VERSIONS:
+        raise HTTPException(400, f"Unknown version '{version}'")
+    for book in (from_book, to_book):
+        if book and book not in cfg.BIBLE_BOOKS:
+            raise HTTPException(400, f"Unknown book '{book}'")
+    try:
+        if from_book:
+            verse_range = passage_range(from_book, from_chapter, to_book, to_chapter)
+        elif verse_low is not None or verse_high is not None:
+            verse_range = (verse_low or 0, verse_high or (len(cfg.BIBLE_BOOKS) + 1) * BOOK_MULTIPLIER)
+        else:
+            verse_range = None
+        return get_service(request).prepare(search_type, q, version, verse_range)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except FileNotFoundError:
+        raise HTTPException(404, "No verse bitmaps found. Run `python -m src.ingestion.verse_bitmaps` first.")
+
+
+def frame_records(df):
+    """Convert a DataFrame to JSON-safe records (numpy scalars become plain numbers)."""
+    return json.loads(df.to_json(orient="records"))
+
+
+def require_strongs_id(query):
+    if query.search_type != "Strong's ID":
+        raise HTTPException(400, "This endpoint only supports Strong's ID searches")
+
+
+def require_artifact(load, hint):
+    """Load a derived artifact, turning a missing build into a 404 with the command to run."""
+    try:
+        return load()
+    except FileNotFoundError:
+        raise HTTPException(404, f"Derived data not found. Run `python -m src.ingestion.{hint}` first.")
+
+
+# --- Endpoints ---
+# Handlers are plain functions, so FastAPI runs them in its thread pool
+# alongside the blocking Elasticsearch client.
+@app.get("/health")
+def health(request: Request):
+    return {"status": "ok", "elasticsearch": bool(get_service(request).es.ping())}
+
+
+@app.get("/cache/stats")
+def cache_stats(request: Request):
+    return get_service(request).cache.stats()
+
+
+@app.get("/search/summary")
+def search_summary(request: Request, query=Depends(resolve_query)):
+    return {"query": query.params, **get_service(request).study(query)}
+
+
+@app.get("/search/chapters")
+def search_chapters(request: Request, query=Depends(resolve_query)):
+    df_chapters, label = get_service(request).chapter_distribution(query)
+    return {"query": query.params, "unit": label, "books": df_chapters.index.tolist(),
+            "chapters": [int(c) for c in df_chapters.columns], "counts": df_chapters.values.tolist()}
+
+
+@app.get("/search/translations")
+def search_translations(request: Request, query=Depends(resolve_query)):
+    return {"query": query.params, "buckets": get_service(request).translations(query)}
+
+
+@app.get("/search/wordcloud")
+def search_wordcloud(request: Request, query=Depends(resolve_query)):
+    png = get_service(request).word_cloud(query)
+    if png is None:
+        raise HTTPException(404, "No word cloud data found")
+    return Response(png, media_type="image/png")
+
+
+@app.get("/search/renderings")
+def search_renderings(request: Request, query=Depends(resolve_query)):
+    require_strongs_id(query)
+    service = get_service(request)
+    require_artifact(service.verse_alignment, "alignment_table")
+    return {"query": query.params, "renderings": frame_records(service.renderings(query))}
+
+
+@app.get("/search/related")
+def search_related(request: Request, top_k: int = cfg.RELATED_WORDS_TOP_K, query=Depends(resolve_query)):
+    service = get_service(request)
+    require_artifact(service.related_words_index, "strongs_embeddings")
+    return {"query": query.params, "related": frame_records(service.related_words(query, top_k=top_k))}
+
+
+@app.get("/search/network")
+def search_network(request: Request, top_k: int = cfg.NETWORK_TOP_K, query=Depends(resolve_query)):
+    require_strongs_id(query)
+    service = get_service(request)
+    require_artifact(lambda: service.cooccurrence_network(query.version), "cooccurrence_network")
+    nodes, edges = service.ego_network(query, top_k=top_k)
+    return {"query": query.params,
+            "nodes": [{"id": n, "verse_count": c} for n, c in nodes],
+            "edges": [{"source": s, "target": t, "weight": w} for s, t, w in edges]}
+
+
+@app.get("/search/verses")
+def search_verses(request: Request, query=Depends(resolve_query)):
+    verse_data = get_service(request).verse_texts(query)
+    return {"query": query.params, "verses": [
+        {"verse": verse_id, "verse_key": verse_data["keys"][verse_id], "text": text,
+         "highlights": verse_data["highlights"].get(verse_id, [])}
+        for verse_id, text in verse_data["verses"].items()
+    ]}
+
+
+@app.get("/search/surrounding")
+def search_surrounding(request: Request, query=Depends(resolve_query)):
+    df_cooc = get_service(request).surrounding_words(query)
+    return {"query": query.params, "words": df_cooc.index.tolist(), "counts": df_cooc.values.tolist()}
+
+
+@app.get("/search/context")
+def search_context(request: Request, verse_key: int, radius: int = 2, query=Depends(resolve_query)):
+    if not 1 <= radius <= cfg.CONTEXT_MAX_RADIUS:
+        raise HTTPException(400, f"radius must be between 1 and {cfg.CONTEXT_MAX_RADIUS}")
+    verses = get_service(request).context(query, verse_key, radius)
+    return {"query": query.params, "verses": [{"verse_key": k, "text": t} for k, t in verses.items()]}
+
+
+@app.get("/search/export")
+def search_export(request: Request, all_versions: bool = False, query=Depends(resolve_query)):
+    """Stream every matching verse part as newline-delimited JSON, one page at a time."""
+    pages = get_service(request).iter_occurrences(query, all_versions=all_versions)
+
+    def ndjson():
+        for page in pages:
+            yield "".join(json.dumps(source, ensure_ascii=False) + "\n" for source in page)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.get("/lexicon")
+def lexicon(request: Request, q: str, top_k: int = cfg.LEXICON_TOP_K):
+    """Diacritic-insensitive fuzzy lookup by original word, transliteration or gloss."""
+    service = get_service(request)
+    require_artifact(service.lexicon, "lexicon_index")
+    return {"query": q, "entries": frame_records(service.lexicon_search(q, top_k=top_k))}
+
+
+class BatchStudyRequest(BaseModel):
+    terms: list[str]
+    versions: list[str] = cfg.BIBLE_VERSIONS
+    search_type: str = "auto"
+
+
+@app.post("/study/batch")
+def study_batch(request: Request, body: BatchStudyRequest):
+    if body.search_type not in ("auto", "Strong's ID", "English word"):
+        raise HTTPException(400, f"Unknown search type '{body.search_type}'")
+    summary_rows, breakdown_rows = get_service(request).study_batch(body.terms, body.versions, body.search_type)
+    return {"summary": summary_rows, "breakdown": breakdown_rows}
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the explorer queries as a JSON API.")
+    parser.add_argument("--host", default=cfg.API_HOST)
+    parser.add_argument("--port", type=int, default=cfg.API_PORT)
+    parser.add_argument("--workers", type=int, default=cfg.API_WORKERS)
+    args = parser.parse_args()
+
+    # Each worker is a separate process with its own service, client pool and in-memory cache;
+    # the SQLite tier (CACHE_DISK_FILE) shares cached results between them
+    uvicorn.run("src.service.api:app", host=args.host, port=args.port, workers=args.workers)
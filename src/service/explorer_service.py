@@ -0,0 +1,372 @@
+import io
+import os
+import threading
+from collections import defaultdict, Counter
+import numpy as np
+import pandas as pd
+from wordcloud import WordCloud, STOPWORDS
+from src.config import base as cfg
+from src.query.alignment import VerseAlignment
+from src.query.batch_study import plan_queries, iter_study_results
+from src.query.boolean_search import VerseBitmapIndex, parse_boolean_query, positive_terms
+from src.query.distribution import fetch_chapter_counts, chapter_matrix_from_counts, chapter_matrix_from_verse_keys
+from src.query.explorer_queries import (
+    connect_es, normalize_term, build_base_query, build_study_query, parse_study_aggregations,
+    build_context_query, build_verse_set_query, STRONGS_ID_PATTERN
+)
+from src.query.export import iter_occurrence_pages, export_occurrences, count_occurrences, build_export_query
+from src.query.lexicon import LexiconIndex
+from src.query.network import CooccurrenceNetwork
+from src.query.related_words import RelatedWords
+from src.query.result_cache import QueryResultCache, make_cache_key
+from src.utils.verse_data import DERIVED_DIR
+
+SEARCH_TYPES = ["Strong's ID", "English word", "Boolean expression"]
+SEARCH_TYPE_SLUGS = {"id": "Strong's ID", "word": "English word", "boolean": "Boolean expression"}
+SURROUNDING_STOPWORDS = STOPWORDS.union({"thee", "thou", "thy", "ye", "unto", "shall", "hath", ""})
+
+
+def default_result_cache(disk_file=cfg.CACHE_DISK_FILE):
+    """
+    Create a result cache with an optional SQLite tier.
+
+    :param disk_file: SQLite file name (relative names live in the derived data folder), or None.
+    :return: QueryResultCache.
+    """
+    disk_path = os.path.join(DERIVED_DIR, disk_file) if disk_file else None
+    return QueryResultCache(disk_path=disk_path)
+
+
+class ExplorerQuery:
+    """A normalized explorer search: the term, its filters and the resolved base query."""
+
+    def __init__(self, search_type, search_input, version, verse_range, base_query, verse_set=None):
+        self.search_type = search_type
+        self.search_input = search_input
+        self.version = version
+        self.verse_range = verse_range
+        self.base_query = base_query
+        self.verse_set = verse_set  # Matching verse keys, for boolean searches only
+
+    @property
+    def params(self):
+        """The parameters that identify this search in the result cache."""
+        return (self.search_type, self.search_input, self.version, self.verse_range)
+
+
+def surrounding_word_matrix(verses, search_input, top_n=30):
+    """
+    Count how often the most common surrounding words appear in the same verse.
+
+    :param verses: Dict of verse id -> full verse text.
+    :param search_input: The searched term, left out of the counts.
+    :param top_n: Number of most common words to keep.
+    :return: Symmetric DataFrame of co-occurrence counts indexed and labelled by word.
+    """
+    word_counter = Counter()
+    cooc_counter = Counter()
+
+    for verse_text in verses.values():
+        words = [word for word in verse_text.split(" ")
+                 if word.lower().strip() not in SURROUNDING_STOPWORDS and word.lower().strip() != search_input]
+        word_counter.update(words)
+
+    top_words = set([w for w, _ in word_counter.most_common(top_n)])
+
+    for wlist in verses.values():
+        unique = set([w for w in wlist.split(" ") if w in top_words])
+        for w1 in unique:
+            for w2 in unique:
+                if w1 < w2:
+                    cooc_counter[(w1, w2)] += 1
+
+    top_words_list = sorted(top_words)
+    word_index = {word: i for i, word in enumerate(top_words_list)}
+    cooc_matrix = np.zeros((len(top_words_list), len(top_words_list)))
+    for (w1, w2), count in cooc_counter.items():
+        i, j = word_index[w1], word_index[w2]
+        cooc_matrix[i, j] = count
+        cooc_matrix[j, i] = count  # Symmetric
+    return pd.DataFrame(cooc_matrix, index=top_words_list, columns=top_words_list)
+
+
+class ExplorerService:
+    """
+    Search, aggregation and verse-fetch logic shared by the Streamlit UI,
+    the JSON API and the batch jobs.
+
+    One instance per process: it owns an Elasticsearch client (whose
+    connection pool is reused across requests), a query result cache and
+    the lazily loaded derived artifacts (networks, bitmaps, embeddings...).
+    """
+
+    def __init__(self, es=None, cache=None):
+        """
+        :param es: Elasticsearch client, or any stand-in with the same methods.
+                   Defaults to connect_es().
+        :param cache: QueryResultCache, defaults to default_result_cache().
+        """
+        self.es = es if es is not None else connect_es()
+        self.cache = cache if cache is not None else default_result_cache()
+        self._resources = {}
+        self._resources_lock = threading.Lock()
+
+    # --- Derived artifacts ---
+    def _resource(self, factory, *args):
+        """Load a derived artifact once per process (FileNotFoundError if it wasn't built)."""
+        key = (factory, *args)
+        with self._resources_lock:
+            if key not in self._resources:
+                self._resources[key] = factory(*args)
+            return self._resources[key]
+
+    def cooccurrence_network(self, version):
+        return self._resource(CooccurrenceNetwork, version)
+
+    def verse_alignment(self):
+        return self._resource(VerseAlignment)
+
+    def verse_bitmaps(self, version):
+        return self._resource(VerseBitmapIndex, version)
+
+    def related_words_index(self):
+        return self._resource(RelatedWords)
+
+    def lexicon(self):
+        return self._resource(LexiconIndex)
+
+    # --- Lexicon ---
+    def lexicon_search(self, text, top_k=cfg.LEXICON_TOP_K):
+        """Strong's entries whose original word, transliteration or gloss fuzzily matches text."""
+        return self.lexicon().search(text, top_k=top_k)
+
+    # --- Query resolution ---
+    def prepare(self, search_type, search_input, version, verse_range=None):
+        """
+        Normalize a search and resolve the base query every panel is filtered by.
+
+        :param search_type: One of SEARCH_TYPES.
+        :param search_input: Raw search term or boolean expression.
+        :param version: Bible version to search.
+        :param verse_range: Optional inclusive (low, high) verse key bounds.
+        :return: ExplorerQuery.
+        :raises ValueError: On an empty term or unknown search type.
+        :raises BooleanQueryError: If a boolean expression can't be parsed.
+        :raises FileNotFoundError: If a boolean search runs before the verse bitmaps are built.
+        """
+        if search_type not in SEARCH_TYPES:
+            raise ValueError(f"Unknown search type '{search_type}'")
+        search_input = normalize_term(search_type, search_input)
+        if not search_input:
+            raise ValueError("Please enter a search term.")
+        verse_range = tuple(verse_range) if verse_range else None
+
+        if search_type == "Boolean expression":
+            tree = parse_boolean_query(search_input)
+            matching_keys = self.verse_bitmaps(version).search(tree)
+            if verse_range:
+                matching_keys = matching_keys[(matching_keys >= verse_range[0]) & (matching_keys <= verse_range[1])]
+            base_query = build_verse_set_query(matching_keys, positive_terms(tree), version)
+            return ExplorerQuery(search_type, search_input, version, verse_range, base_query, matching_keys)
+
+        base_query = build_base_query(search_type, search_input, version, verse_range=verse_range)
+        return ExplorerQuery(search_type, search_input, version, verse_range, base_query)
+
+    def cached(self, panel, query, compute):
+        """Serve a panel result for a query from the result cache, computing it on a miss."""
+        return self.cache.get_or_compute(make_cache_key(panel, *query.params), compute)
+
+    def cached_search(self, panel, query, body):
+        """Run a search body for a query, served from the result cache when possible."""
+        return self.cached(panel, query, lambda: self._search_body(body))
+
+    def _search_body(self, body):
+        # Plain dict responses (test doubles) have no .body; client responses do
+        res = self.es.search(index=cfg.ES_VERSE_INDEX_NAME, body=body)
+        return getattr(res, "body", res)
+
+    # --- Panels ---
+    def study(self, query):
+        """Summary, by-book, testament and literary type stats in a single request."""
+        return parse_study_aggregations(self.cached_search("study", query, build_study_query(query.base_query)))
+
+    def chapter_distribution(self, query):
+        """
+        Book x chapter distribution of a search.
+
+        :return: Tuple of (DataFrame, label) where label says whether cells
+                 count "Verses" (boolean searches) or "Occurrences".
+        """
+        if query.verse_set is not None:
+            # Boolean searches already hold their matching verse keys, so bin them locally
+            return chapter_matrix_from_verse_keys(query.verse_set), "Verses"
+        counts = self.cached("chapters", query, lambda: fetch_chapter_counts(self.es, query.base_query))
+        return chapter_matrix_from_counts(counts), "Occurrences"
+
+    def translations(self, query):
+        """
+        English renderings of a Strong's ID, or the Strong's IDs behind an
+        English word/boolean search, with their occurrence counts.
+
+        :return: List of {"key", "doc_count"} buckets, most frequent first.
+        """
+        field = "verse_part.keyword" if query.search_type == "Strong's ID" else "hebrew_id"
+        body = {
+            "size": 0,
+            "query": query.base_query,
+            "aggs": {"translations": {"terms": {"field": field, "size": 1000}}}
+        }
+        res = self.cached_search("wordcloud", query, body)
+        buckets = res.get("aggregations", {}).get("translations", {}).get("buckets", [])
+        return [b for b in buckets if b["key"]]
+
+    def word_cloud(self, query):
+        """
+        Word cloud of the translations, rendered once and cached as a PNG.
+
+        :return: PNG bytes, or None if there is nothing to draw.
+        """
+        def render():
+            text_wc = " ".join(b["key"] for b in self.translations(query))
+            if not text_wc:
+                return None
+            wordcloud = WordCloud(
+                width=800, height=400, background_color="white",
+                stopwords=STOPWORDS, collocations=False
+            ).generate(text_wc)
+            png = io.BytesIO()
+            wordcloud.to_image().save(png, format="PNG")
+            return png.getvalue()
+        return self.cached("wordcloud_image", query, render)
+
+    def renderings(self, query):
+        """How each version renders a Strong's ID, verse by verse (Strong's ID searches only)."""
+        df_align = self.verse_alignment().for_id(query.search_input)
+        return df_align.drop(columns=["verse_key", "hebrew_id"])
+
+    def related_words(self, query, top_k=cfg.RELATED_WORDS_TOP_K):
+        """
+        Strong's IDs most related to the search, from the PPMI/SVD embeddings.
+
+        English and boolean searches are placed by the Strong's IDs they
+        translate, weighted by how often.
+        """
+        related = self.related_words_index()
+        if query.search_type == "Strong's ID":
+            return related.most_similar(query.search_input, top_k=top_k)
+        top_ids = self.translations(query)[:10]
+        return related.most_similar([b["key"] for b in top_ids], weights=[b["doc_count"] for b in top_ids],
+                                    top_k=top_k)
+
+    def ego_network(self, query, top_k=cfg.NETWORK_TOP_K):
+        """Pruned co-occurrence ego-network around a Strong's ID, as (nodes, edges)."""
+        return self.cooccurrence_network(query.version).ego_network(query.search_input, top_k=top_k)
+
+    def verse_texts(self, query):
+        """
+        Full texts of the (first 1,000) matching verses in canonical order.
+
+        :return: Dict with "verses" (verse id -> text), "keys" (verse id -> verse key)
+                 and "highlights" (verse id -> words to highlight: the renderings of the
+                 searched Strong's IDs plus the searched English words).
+        """
+        return self.cached("verses", query, lambda: self._fetch_verse_texts(query))
+
+    def _fetch_verse_texts(self, query):
+        unique_verses_query = {
+            "size": 0,
+            "query": query.base_query,
+            "aggs": {
+                "unique_verses": {
+                    "terms": {"field": "verse_key", "size": 1000, "order": {"_key": "asc"}}
+                }
+            }
+        }
+        res_unique_verses = self.cached_search("unique_verses", query, unique_verses_query)
+        buckets_unique_verses = res_unique_verses.get("aggregations", {}).get("unique_verses", {}).get("buckets", [])
+        unique_verses = [bucket["key"] for bucket in buckets_unique_verses]
+
+        # Page through the verse parts in canonical verse order (point-in-time + search_after)
+        verse_parts_query = {
+            "bool": {
+                "must": [{"terms": {"verse_key": unique_verses}}],
+                "filter": [{"term": {"version": query.version}}]
+            }
+        }
+
+        # The searched IDs are highlighted by how each verse renders them, words as typed
+        if query.search_type == "Boolean expression":
+            terms = positive_terms(parse_boolean_query(query.search_input))
+            strongs_ids = {term for term in terms if STRONGS_ID_PATTERN.match(term)}
+            words = [term for term in terms if term not in strongs_ids]
+        elif query.search_type == "Strong's ID":
+            strongs_ids, words = {query.search_input}, []
+        else:
+            strongs_ids, words = set(), [query.search_input]
+
+        # Group verse parts by bible_verse
+        verse_texts = defaultdict(list)
+        verse_keys = {}
+        highlight_words = defaultdict(lambda: list(words))
+        for page in iter_occurrence_pages(self.es, verse_parts_query):
+            for source in page:
+                verse_id = source['bible_verse']
+                verse_texts[verse_id].append(source['verse_part'])
+                verse_keys[verse_id] = source['verse_key']
+                # Remember how this verse renders the searched Strong's IDs for highlighting
+                rendering = source['verse_part']
+                if source.get('hebrew_id') in strongs_ids and rendering and rendering not in highlight_words[verse_id]:
+                    highlight_words[verse_id].append(rendering)
+
+        concatenated_verses = {verse_id: " ".join(parts) for verse_id, parts in verse_texts.items()}
+        return {"verses": concatenated_verses, "keys": verse_keys,
+                "highlights": {verse_id: highlight_words[verse_id] for verse_id in verse_texts}}
+
+    def surrounding_words(self, query):
+        """Co-occurrence matrix of the words surrounding the search term in the matching verses."""
+        return self.cached("surrounding", query,
+                           lambda: surrounding_word_matrix(self.verse_texts(query)["verses"], query.search_input))
+
+    def context(self, query, center_key, radius):
+        """
+        The verses within +/- radius of a verse, fetched with one range query.
+
+        :return: Dict of verse key -> verse text, in canonical order.
+        """
+        res_context = self.cached_search(f"context:{center_key}:{radius}", query,
+                                         build_context_query(center_key, query.version, radius))
+        context_parts = defaultdict(list)
+        for hit in res_context["hits"]["hits"]:
+            context_parts[hit["_source"]["verse_key"]].append(hit["_source"]["verse_part"])
+        return {key: " ".join(parts) for key, parts in context_parts.items()}
+
+    # --- Exports and batch studies ---
+    def export_query(self, query, all_versions=False):
+        """The query an export runs: the search itself, or the same term across every version."""
+        if all_versions and query.search_type != "Boolean expression":
+            return build_export_query(query.search_type, query.search_input, cfg.BIBLE_VERSIONS, query.verse_range)
+        return query.base_query
+
+    def iter_occurrences(self, query, all_versions=False, page_size=cfg.EXPORT_PAGE_SIZE):
+        """Stream every matching verse part as pages of _source dicts (see export.iter_occurrence_pages)."""
+        return iter_occurrence_pages(self.es, self.export_query(query, all_versions), page_size=page_size)
+
+    def export_count(self, query, all_versions=False):
+        """Number of verse parts an export would write (one count request, nothing fetched)."""
+        return count_occurrences(self.es, self.export_query(query, all_versions))
+
+    def export(self, query, path, fmt="csv", all_versions=False):
+        """Export every matching verse part to a file and return the number of rows written."""
+        return export_occurrences(self.es, self.export_query(query, all_versions), path, fmt=fmt)
+
+    def study_batch(self, terms, versions, search_type="auto"):
+        """
+        Summary stats for many terms at once, via batched msearch requests.
+
+        :return: Tuple of (summary_rows, breakdown_rows) as in batch_study.
+        """
+        summary_rows, breakdown_rows = [], []
+        for summaries, breakdowns in iter_study_results(self.es, plan_queries(terms, versions, search_type)):
+            summary_rows.extend(summaries)
+            breakdown_rows.extend(breakdowns)
+        return summary_rows, breakdown_rows
@@ -0,0 +1,145 @@
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.config import base as cfg
+from src.query.explorer_queries import STRONGS_ID_PATTERN
+from src.service.explorer_service import ExplorerService, SURROUNDING_STOPWORDS, default_result_cache
+
+
+def peak_rss_bytes():
+    """Peak resident memory of this process in bytes, or None where it can't be read (Windows)."""
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, KiB on Linux
+
+
+def top_terms(bitmaps, top_n=cfg.WARMUP_TOP_N):
+    """
+    The most frequent Strong's IDs and English words of one version, by the
+    number of verses they occur in (read from its verse bitmaps).
+
+    :param bitmaps: VerseBitmapIndex of the version.
+    :param top_n: Number of IDs and of words to return.
+    :return: Tuple of (strongs_ids, english_words), most frequent first.
+    """
+    verse_counts = np.diff(bitmaps.offsets)
+    ranked = sorted(bitmaps.term_index, key=lambda term: -verse_counts[bitmaps.term_index[term]])
+    strongs_ids = [term for term in ranked if STRONGS_ID_PATTERN.match(term)][:top_n]
+    english_words = [term for term in ranked
+                     if not STRONGS_ID_PATTERN.match(term) and len(term) > 2
+                     and term not in SURROUNDING_STOPWORDS][:top_n]
+    return strongs_ids, english_words
+
+
+def warm_query(service, query):
+    """
+    Compute every panel of a search so its results land in the result cache,
+    and the ES/filesystem caches behind them are hot.
+
+    :param service: ExplorerService whose cache is being warmed.
+    :param query: ExplorerQuery from service.prepare.
+    """
+    service.study(query)
+    service.chapter_distribution(query)
+    service.word_cloud(query)
+    service.surrounding_words(query)  # Also fetches the verse texts
+    local_panels = [service.related_words]
+    if query.search_type == "Strong's ID":
+        local_panels += [service.ego_network, service.renderings]
+    for panel in local_panels:
+        try:
+            panel(query)
+        except FileNotFoundError:
+            pass  # Derived data not built yet; nothing to warm
+
+
+def plan_warmup(service, versions=cfg.BIBLE_VERSIONS, top_n=cfg.WARMUP_TOP_N):
+    """
+    Pick the searches to warm: the top_n IDs and words of every version.
+
+    :return: List of ExplorerQuery objects.
+    """
+    planned = []
+    for version in versions:
+        try:
+            strongs_ids, english_words = top_terms(service.verse_bitmaps(version), top_n)
+        except FileNotFoundError:
+            print(f"⚠️ No verse bitmaps for {version}; run `python -m src.ingestion.verse_bitmaps` first")
+            continue
+        planned += [service.prepare("Strong's ID", term, version) for term in strongs_ids]
+        planned += [service.prepare("English word", term, version) for term in english_words]
+    return planned
+
+
+def run_warmup(service, versions=cfg.BIBLE_VERSIONS, top_n=cfg.WARMUP_TOP_N,
+               max_concurrency=cfg.WARMUP_CONCURRENCY):
+    """
+    Warm the result cache with the full panel results of the most frequent terms.
+
+    :param service: ExplorerService to warm.
+    :param versions: Bible versions to warm.
+    :param top_n: Number of Strong's IDs and of English words per version.
+    :param max_concurrency: Number of searches warmed in parallel.
+    :return: Dict with the search count, failures, elapsed seconds, cache
+             entries, in-memory and SQLite cache bytes and peak process memory.
+    """
+    start = time.time()
+    planned = plan_warmup(service, versions, top_n)
+
+    def warm(query):
+        try:
+            # Warmed results only go stale with the indices, not after CACHE_TTL_SECONDS
+            with service.cache.no_expiry():
+                warm_query(service, query)
+            return None
+        except Exception as e:  # One failing term shouldn't stop the rest from warming
+            return f"{query.search_input} ({query.version}): {e}"
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        failures = [error for error in pool.map(warm, planned) if error]
+
+    stats = service.cache.stats()
+    return {"searches": len(planned), "failures": failures, "seconds": time.time() - start,
+            "cache_entries": stats["entries"], "evictions": stats["evictions"],
+            "cache_bytes": service.cache.memory_usage(), "cache_disk_bytes": service.cache.disk_usage(),
+            "peak_rss_bytes": peak_rss_bytes()}
+
+
+def print_warmup_report(result):
+    """Print how long warmup took and how much memory the caches use."""
+    print(f"✅ Warmed {result['searches'] - len(result['failures']):,}/{result['searches']:,} searches "
+          f"in {result['seconds']:.1f}s")
+    peak_rss = result["peak_rss_bytes"]
+    print(f"📦 Result cache: {result['cache_entries']:,} entries, {result['cache_bytes'] / 2**20:,.1f} MiB in memory, "
+          f"{result['cache_disk_bytes'] / 2**20:,.1f} MiB on disk ({result['evictions']:,} evicted); peak process RSS "
+          + (f"{peak_rss / 2**20:,.0f} MiB" if peak_rss is not None else "unavailable"))
+    if result["evictions"]:
+        print("⚠️ The cache evicted warmed results; raise CACHE_MAX_ENTRIES or lower --top-n")
+    for failure in result["failures"]:
+        print(f"❌ {failure}")
+
+
+# ---- MAIN EXECUTION BLOCK ----
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute and cache panel results for the most frequent terms.")
+    parser.add_argument("--versions", nargs="+", default=cfg.BIBLE_VERSIONS)
+    parser.add_argument("--top-n", type=int, default=cfg.WARMUP_TOP_N)
+    parser.add_argument("--concurrency", type=int, default=cfg.WARMUP_CONCURRENCY)
+    parser.add_argument("--cache-file", default=cfg.CACHE_DISK_FILE,
+                        help="SQLite result cache to fill; must be the file the app and API read (CACHE_DISK_FILE)")
+    args = parser.parse_args()
+
+    # Results only outlive this process through the SQLite tier
+    if not args.cache_file:
+        parser.error("a disk cache is required: set CACHE_DISK_FILE or pass --cache-file")
+    if args.cache_file != cfg.CACHE_DISK_FILE:
+        print(f"⚠️ Warming {args.cache_file}, but the app and API read {cfg.CACHE_DISK_FILE}")
+    service = ExplorerService(cache=default_result_cache(args.cache_file))
+    result = run_warmup(service, args.versions, args.top_n, args.concurrency)
+    print_warmup_report(result)
+    print(f"💾 Warmed results saved to {service.cache.disk_path}")
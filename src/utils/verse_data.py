@@ -0,0 +1,71 @@
+import os
+import pandas as pd
+from src.config import base as cfg
+from src.utils.verse_keys import verse_keys_for
+
+# Define the directory containing scraped verse & strong id data
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'scraped_docs')
+# Define the directory every derived artifact is written to and read from
+DERIVED_DIR = os.path.join(DATA_DIR, cfg.DERIVED_DATA_FOLDER)
+VERSE_DATA_DIR = os.path.join(DATA_DIR, cfg.VERSE_DATA_FOLDER)
+VERSE_DATA_CACHE = os.path.join(DERIVED_DIR, cfg.VERSE_DATA_CACHE_FILE)
+
+STRING_COLUMNS = ["bible_book", "bible_verse", "verse_part_type", "verse_part", "hebrew_id",
+                  "lit_type", "testament_type", "version"]
+
+
+def verse_csv_paths(folder=VERSE_DATA_DIR):
+    """Paths of every verse CSV under the version-named subdirectories of folder."""
+    paths = []
+    for version in sorted(v for v in os.listdir(folder) if not v.startswith('.')):
+        version_path = os.path.join(folder, version)
+        paths += [os.path.join(version_path, f) for f in sorted(os.listdir(version_path)) if f.endswith(".csv")]
+    return paths
+
+
+def parse_verse_csvs(folder=VERSE_DATA_DIR):
+    """
+    Reads every verse CSV and applies the cleaning rules shared by all pipeline steps.
+
+    References and verse parts are stripped, missing verse parts become "",
+    every row gets its canonical verse_key, and rows whose reference doesn't
+    parse (e.g. notes on omitted verses) are dropped. Rows without a Strong's
+    ID are kept; steps that only use IDs drop them.
+
+    :param folder: Path to the verse_data folder with version-named subdirectories.
+    :return: DataFrame with every CSV column plus an int64 verse_key column.
+    """
+    df = pd.concat([pd.read_csv(path, dtype={c: str for c in STRING_COLUMNS})
+                    for path in verse_csv_paths(folder)], ignore_index=True)
+    df["bible_verse"] = df["bible_verse"].str.strip()
+    df["verse_part"] = df["verse_part"].fillna("").str.strip()
+    df["verse_key"] = verse_keys_for(df)
+    df = df.dropna(subset=["verse_key"]).reset_index(drop=True)
+    df["verse_key"] = df["verse_key"].astype("int64")
+    return df
+
+
+def load_verse_data(folder=VERSE_DATA_DIR, usecols=None, cache_path=VERSE_DATA_CACHE):
+    """
+    Loads the cleaned verse parts of every version (see parse_verse_csvs).
+
+    The CSVs are parsed once into a Parquet cache, which later pipeline steps
+    read column by column; it is rebuilt whenever a CSV is newer than it.
+
+    :param folder: Path to the verse_data folder with version-named subdirectories.
+    :param usecols: Columns to return (verse_key is always included); None for all.
+    :param cache_path: Parquet cache file of this folder, or None to always parse the CSVs.
+    :return: DataFrame of verse parts in file order.
+    """
+    columns = None if usecols is None else list(dict.fromkeys([*usecols, "verse_key"]))
+    if cache_path is None:
+        df = parse_verse_csvs(folder)
+        return df if columns is None else df[columns]
+
+    newest_csv = max(os.path.getmtime(path) for path in verse_csv_paths(folder))
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < newest_csv:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        parse_verse_csvs(folder).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)  # Atomic, so a concurrent step never reads half a file
+    return pd.read_parquet(cache_path, columns=columns)
@@ -0,0 +1,88 @@
+import re
+import pandas as pd
+from src.config import base as cfg
+
+# verse_key = book ordinal * BOOK_MULTIPLIER + chapter * CHAPTER_MULTIPLIER + verse,
+# e.g. Ruth 1:16 -> 8_001_016. Keys sort canonically and fit in an ES integer.
+BOOK_MULTIPLIER = 1_000_000
+CHAPTER_MULTIPLIER = 1_000
+
+BOOK_ORDINALS = {book: i + 1 for i, book in enumerate(cfg.BIBLE_BOOKS)}
+VERSE_REF_PATTERN = re.compile(r"(\d+):(\d+)\s*$")
+TRAILING_CHAPTER_PATTERN = re.compile(r"\s+\d+$")
+
+
+def book_ordinal(bible_book):
+    """
+    Return the canonical 1-based ordinal of a book, or None if it is unknown.
+    Tolerates stray chapter numbers scraped into the book name ("Song of Solomon 1").
+    """
+    book = str(bible_book).strip()
+    if book not in BOOK_ORDINALS:
+        book = TRAILING_CHAPTER_PATTERN.sub("", book)
+    return BOOK_ORDINALS.get(book)
+
+
+def encode_verse_key(bible_book, chapter, verse):
+    """Encode a (book, chapter, verse) reference as a canonical integer key."""
+    return book_ordinal(bible_book) * BOOK_MULTIPLIER + int(chapter) * CHAPTER_MULTIPLIER + int(verse)
+
+
+def decode_verse_key(verse_key):
+    """Decode a verse key back into a (book, chapter, verse) tuple."""
+    verse_key = int(verse_key)
+    return (cfg.BIBLE_BOOKS[verse_key // BOOK_MULTIPLIER - 1],
+            verse_key % BOOK_MULTIPLIER // CHAPTER_MULTIPLIER,
+            verse_key % CHAPTER_MULTIPLIER)
+
+
+def format_verse_key(verse_key):
+    """Format a verse key as a human readable reference, e.g. "Ruth 1:16"."""
+    book, chapter, verse = decode_verse_key(verse_key)
+    return f"{book} {chapter}:{verse}"
+
+
+def parse_verse_key(bible_book, bible_verse):
+    """
+    Derive the verse key from the stored book and concatenated verse string
+    (e.g. "Ruth", "Ruth1:16").
+
+    :return: Integer verse key, or None when the reference can't be parsed
+             (e.g. verses the source marks as omitted).
+    """
+    ordinal = book_ordinal(bible_book)
+    match = VERSE_REF_PATTERN.search(str(bible_verse).replace("\xa0", " "))
+    if ordinal is None or match is None:
+        return None
+    return ordinal * BOOK_MULTIPLIER + int(match.group(1)) * CHAPTER_MULTIPLIER + int(match.group(2))
+
+
+def verse_keys_for(df):
+    """
+    Vectorized parse_verse_key over a DataFrame with bible_book and bible_verse columns.
+
+    :param df: DataFrame of verse parts.
+    :return: Nullable Int64 Series of verse keys aligned with df.
+    """
+    ordinals = df["bible_book"].map(book_ordinal)
+    refs = df["bible_verse"].astype(str).str.replace("\xa0", " ").str.extract(VERSE_REF_PATTERN)
+    keys = (ordinals * BOOK_MULTIPLIER
+            + pd.to_numeric(refs[0], errors="coerce") * CHAPTER_MULTIPLIER
+            + pd.to_numeric(refs[1], errors="coerce"))
+    return keys.astype("Int64")
+
+
+def passage_range(start_book, start_chapter=None, end_book=None, end_chapter=None):
+    """
+    Return the inclusive (low, high) verse key bounds of a passage, e.g.
+    passage_range("Genesis", 1, "Genesis", 11) for "Genesis 1-11".
+
+    Omitted chapters cover the whole book; an omitted end book means the start book.
+    """
+    end_book = end_book or start_book
+    low = book_ordinal(start_book) * BOOK_MULTIPLIER + (start_chapter or 0) * CHAPTER_MULTIPLIER
+    if end_chapter is None:
+        high = (book_ordinal(end_book) + 1) * BOOK_MULTIPLIER - 1
+    else:
+        high = book_ordinal(end_book) * BOOK_MULTIPLIER + (end_chapter + 1) * CHAPTER_MULTIPLIER - 1
+    return low, high
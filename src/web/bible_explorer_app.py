@@ -1,26 +1,35 @@
+import re
+import threading
+from urllib.parse import urlencode
 import streamlit as st
-from elasticsearch import Elasticsearch
+import streamlit.components.v1 as components
 from src.config import base as cfg
-from elasticsearch.helpers import scan
-from wordcloud import WordCloud, STOPWORDS
-from pyvis.network import Network
-from collections import defaultdict, Counter
-import re
 import pandas as pd
-from collections import Counter
-import re
-import networkx as nx
-import seaborn as sns
-import numpy as np
-import matplotlib.pyplot as plt
 import plotly.express as px
-
-# --- Connect to Elasticsearch ---
-es = Elasticsearch(
-    hosts=st.secrets["ES_HOST"],
-    api_key=st.secrets["ES_API_KEY"],
-    verify_certs=True
-    )
+from src.web.network_explorer import render_ego_network
+from src.service.explorer_service import ExplorerService, SEARCH_TYPES, SEARCH_TYPE_SLUGS
+from src.service.warmup import run_warmup, print_warmup_report
+from src.query.explorer_queries import connect_es
+from src.query.export import EXPORT_FORMATS, TemporaryExport
+from src.query.boolean_search import BooleanQueryError
+from src.utils.verse_keys import passage_range, format_verse_key
+
+@st.cache_resource
+def load_explorer_service():
+    """Create the explorer service (ES client, result cache, derived data) shared by every session in this process."""
+    return ExplorerService(es=connect_es())
+
+service = load_explorer_service()
+
+@st.cache_resource
+def start_cache_warmup():
+    """Warm the shared result cache with the most frequent terms in the background, once per server process."""
+    thread = threading.Thread(target=lambda: print_warmup_report(run_warmup(service)), daemon=True)
+    thread.start()
+    return thread
+
+if cfg.WARMUP_ON_STARTUP:
+    start_cache_warmup()
 
 es_verse_index = cfg.ES_VERSE_INDEX_NAME
 es_strongs_id_index = cfg.ES_VERSE_INDEX_NAME
@@ -31,86 +40,95 @@ st.title("📖 Bible Word Explorer")
 # --- Sidebar ---
 with st.sidebar:
     st.header("Search Filters")
-    search_type = st.radio("Search for:", ["Strong's ID", "English word"])
+    search_type = st.radio("Search for:", SEARCH_TYPES)
     search_input = st.text_input(
-        "Enter Strong's ID or English word:",
-        value="G1411" if search_type == "Strong's ID" else ""
+        "Enter Strong's ID, English word or boolean expression:",
+        value="G1411" if search_type == "Strong's ID" else "",
+        help="Boolean expressions combine IDs and words within a verse, e.g. H2617 AND H571 NOT H7965"
     )
     version_filter = st.selectbox(
         "Filter by version:",
-        ["ASV", "KJV", "ESV", "NIV", "NLT", "LXX"]
+        cfg.BIBLE_VERSIONS
     )
+
+    with st.expander("Limit to a passage"):
+        limit_passage = st.checkbox("Only search within a passage")
+        start_book = st.selectbox("From book:", cfg.BIBLE_BOOKS, index=0)
+        start_chapter = st.number_input("From chapter:", min_value=1, value=1, step=1)
+        end_book = st.selectbox("To book:", cfg.BIBLE_BOOKS, index=0)
+        end_chapter = st.number_input("To chapter:", min_value=1, value=11, step=1)
+    verse_range = passage_range(start_book, int(start_chapter), end_book, int(end_chapter)) if limit_passage else None
+
     search_triggered = st.button("Search")
 
-# Clean search input
-if search_type == "English word":
-    search_input = search_input.lower().strip()
-else:
-    search_input = search_input.strip()
+    with st.expander("Lexicon lookup"):
+        lexicon_input = st.text_input(
+            "Original word, transliteration or gloss:",
+            help="Accents and vowel points are ignored, e.g. חסד, checed, agape or lovingkindness"
+        )
+        if lexicon_input.strip():
+            try:
+                df_lexicon = service.lexicon_search(lexicon_input)
+            except FileNotFoundError:
+                st.info("No lexicon index found. Run `python -m src.ingestion.lexicon_index` first.")
+            else:
+                if not df_lexicon.empty:
+                    st.dataframe(
+                        df_lexicon[["strongs_id", "original_word", "transliteration", "kjv"]].rename(
+                            columns={"strongs_id": "Strong's ID", "original_word": "Original Word",
+                                     "transliteration": "Transliteration", "kjv": "KJV"}),
+                        use_container_width=True, hide_index=True
+                    )
+                else:
+                    st.info("No lexicon entries found.")
+
+    with st.expander("Cache statistics"):
+        st.json(service.cache.stats())
 
 # --- Session State ---
-if "base_query" not in st.session_state:
-    st.session_state.base_query = None
+if "query" not in st.session_state:
+    st.session_state.query = None
+if "export" not in st.session_state:
+    st.session_state.export = None
+    st.session_state.export_too_large = None
 if "book_selection" not in st.session_state:
     st.session_state.book_selection = None
 
+def discard_export():
+    """Delete the session's prepared export file, if any (it is also deleted when the session ends)."""
+    if st.session_state.export is not None:
+        st.session_state.export.discard()
+    st.session_state.export = None
+    st.session_state.export_too_large = None
+
 # --- Build Query ---
 if search_triggered:
-    if not search_input.strip():
-        st.warning("Please enter a search term.")
+    try:
+        st.session_state.query = service.prepare(search_type, search_input, version_filter, verse_range)
+    except BooleanQueryError as e:
+        st.error(f"Could not parse boolean expression: {e}")
+    except FileNotFoundError:
+        st.info("No verse bitmaps found. Run `python -m src.ingestion.verse_bitmaps` first.")
+    except ValueError as e:
+        st.warning(str(e))
     else:
-        must_clause = [{"term": {"hebrew_id": search_input}}] if search_type == "Strong's ID" else [{"match_phrase": {"verse_part": search_input}}]
-        base_query = {"bool": {"must": must_clause, "filter": []}}
-    if version_filter:
-        base_query["bool"]["filter"].append({"term": {"version": version_filter}})
-        st.session_state.base_query = base_query
         st.session_state.book_selection = None
+        discard_export()
 
 # --- Perform Search ---
-if st.session_state.base_query:
-    base_query = st.session_state.base_query
+if st.session_state.query:
+    query = st.session_state.query
+    # Panels describe the submitted search, not whatever is currently typed in the sidebar
+    search_type, search_input, version_filter = query.search_type, query.search_input, query.version
 
     # --- Summary Stats Panel ---
     st.subheader(f"📌 Summary Statistics: {search_input}")
 
-    # Total number of occurrences
-    total_occurrences_query = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "total_occurrences": {
-                "value_count": {"field": "verse_part.keyword"}
-            }
-        }
-    }
-    res_total = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=total_occurrences_query)
-    total_occurrences = res_total.get("aggregations", {}).get("total_occurrences", {}).get("value", 0)
-
-    # Distinct number of books
-    distinct_books_query = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "distinct_books": {
-                "cardinality": {"field": "bible_book"}
-            }
-        }
-    }
-    res_books = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=distinct_books_query)
-    distinct_books = res_books.get("aggregations", {}).get("distinct_books", {}).get("value", 0)
-
-    # Unique verses
-    unique_verses_query = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "unique_verses": {
-                "cardinality": {"field": "bible_verse"}
-            }
-        }
-    }
-    res_unique_verses = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=unique_verses_query)
-    unique_verse_count = res_unique_verses.get("aggregations", {}).get("unique_verses", {}).get("value", 0)
+    # Summary, book, testament and literary type stats in a single request
+    study = service.study(query)
+    total_occurrences = study["total_occurrences"]
+    distinct_books = study["distinct_books"]
+    unique_verse_count = study["unique_verses"]
 
     # Display in two columns
     col1, col2, col3 = st.columns(3)
@@ -126,19 +144,8 @@ if st.session_state.base_query:
 
     # --- Frequency by Book ---
     st.subheader("📊 Frequency by Bible Book")
-    agg_book = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "by_book": {
-                "terms": {"field": "bible_book", "size": 100, "order": {"_key": "asc"}}
-            }
-        }
-    }
-    res_book = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=agg_book)
-    df_book = pd.DataFrame(res_book["aggregations"]["by_book"]["buckets"])
+    df_book = pd.DataFrame(list(study["by_book"].items()), columns=["Book", "Count"])
     if not df_book.empty:
-        df_book.columns = ["Book", "Count"]
         df_book_sorted = df_book.sort_values("Count", ascending=False)
         fig = px.bar(
             df_book_sorted,
@@ -152,35 +159,27 @@ if st.session_state.base_query:
     else:
         st.info("No book frequency data available.")
 
+    # --- Distribution by Book and Chapter ---
+    st.subheader("🗺️ Distribution by Book and Chapter")
+    df_chapters, density_label = service.chapter_distribution(query)
+
+    if not df_chapters.empty:
+        fig_chapters = px.imshow(
+            df_chapters,
+            labels=dict(x="Chapter", y="Book", color=density_label),
+            color_continuous_scale="YlGnBu",
+            aspect="auto"
+        )
+        fig_chapters.update_layout(height=max(300, 22 * len(df_chapters)), margin=dict(l=50, r=50, t=30, b=50))
+        st.plotly_chart(fig_chapters, use_container_width=True)
+    else:
+        st.info("No chapter distribution data available.")
+
     # --- Frequency by Testament ---
-    agg_test = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "by_testament": {
-                "terms": {"field": "testament_type", "size": 10}
-            }
-        }
-    }
-    res_test = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=agg_test)
-    df_test = pd.DataFrame(res_test["aggregations"]["by_testament"]["buckets"])
-    if not df_test.empty:
-        df_test.columns = ["Testament", "Count"]
+    df_test = pd.DataFrame(list(study["by_testament"].items()), columns=["Testament", "Count"])
 
     # --- Frequency by Literary Type ---
-    agg_lit = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "by_lit": {
-                "terms": {"field": "lit_type", "size": 10}
-            }
-        }
-    }
-    res_lit = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=agg_lit)
-    df_lit = pd.DataFrame(res_lit["aggregations"]["by_lit"]["buckets"])
-    if not df_lit.empty:
-        df_lit.columns = ["Literary Type", "Count"]
+    df_lit = pd.DataFrame(list(study["by_lit"].items()), columns=["Literary Type", "Count"])
 
     # --- Display side-by-side pie charts ---
     col1, col2 = st.columns(2)
@@ -215,148 +214,68 @@ if st.session_state.base_query:
         else:
             st.info("No literary type data available.")
 
+    # --- Cross-Version Renderings ---
+    if search_type == "Strong's ID":
+        st.subheader("🔀 Rendering Across Versions")
+        try:
+            df_align = service.renderings(query)
+        except FileNotFoundError:
+            st.info("No alignment table found. Run `python -m src.ingestion.alignment_table` first.")
+        else:
+            if not df_align.empty:
+                st.dataframe(df_align, use_container_width=True, hide_index=True)
+            else:
+                st.info("No cross-version renderings found.")
+
     # --- Word Cloud ---
     st.subheader("☁️ Word Cloud of Translations")
 
-    if search_type == "Strong's ID":
-        # Word cloud based on English words related to the Strong's ID
-        query_wc = {
-            "size": 0,
-            "query": base_query,
-            "aggs": {
-                "unique_translations": {
-                    "terms": {"field": "verse_part.keyword", "size": 1000}
-                }
-            }
-        }
-        res_wc = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=query_wc)
-        buckets_wc = res_wc.get("aggregations", {}).get("unique_translations", {}).get("buckets", [])
-        text_wc = " ".join([b["key"] for b in buckets_wc if b["key"]])
+    # English words rendering a Strong's ID, or the Strong's IDs behind an English word
+    image_wc = service.word_cloud(query)
 
-    else:
-        # Word cloud based on Strong's IDs associated with the English word
-        strongs_id_agg_query = {
-            "size": 0,
-            "query": base_query,
-            "aggs": {
-                "unique_strongs_ids": {
-                    "terms": {"field": "hebrew_id", "size": 1000}
-                }
-            }
-        }
-        res_strongs = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=strongs_id_agg_query)
-        buckets_strongs = res_strongs.get("aggregations", {}).get("unique_strongs_ids", {}).get("buckets", [])
-        text_wc = " ".join([b["key"] for b in buckets_strongs if b["key"]])
-
-    if text_wc:
-        wordcloud = WordCloud(
-            width=800, height=400, background_color="white",
-            stopwords=STOPWORDS, collocations=False
-        ).generate(text_wc)
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.imshow(wordcloud, interpolation="bilinear")
-        ax.axis("off")
-        st.pyplot(fig)
+    if image_wc is not None:
+        st.image(image_wc, use_container_width=True)
     else:
         st.info("No word cloud data found.")
 
 
-    # --- Surrounding Words + Co-occurrence ---
-    st.subheader("🔍 Surrounding Word Co-occurrence Heatmap")
-    # --- Find Unique verses ---
-    unique_verses_query = {
-        "size": 0,
-        "query": base_query,
-        "aggs": {
-            "unique_verses": {
-                "terms": {"field": "bible_verse", "size": 1000}
-            }
-        }
-    }
-    res_unique_verses = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=unique_verses_query)
-    buckets_unique_verses = res_unique_verses.get("aggregations", {}).get("unique_verses", {}).get("buckets", [])
-    unique_verses = [bucket["key"] for bucket in buckets_unique_verses]
-
-    # Use scan helper to handle scroll + batching
-    all_verse_parts_results = scan(
-        client=es,
-        index=cfg.ES_VERSE_INDEX_NAME,
-        query={
-            "query": {
-                "bool": {
-                    "must": [
-                        {
-                            "terms": {
-                                "bible_verse": unique_verses
-                            }
-                        }
-                    ],
-                    "filter": [
-                        {
-                            "term": {
-                                "version": version_filter
-                            }
-                        }
-                    ]
-                }
-            }
-        },
-        preserve_order=True
-    )
-
-    # Convert to list (we want all in memory at once)
-    all_verse_parts = list(all_verse_parts_results)
-
-    # 1️⃣ Group verse parts by bible_verse
-    verse_texts = defaultdict(list)
-
-    for doc in all_verse_parts:
-        verse_id = doc['_source']['bible_verse']
-        verse_part_text = doc['_source']['verse_part']
-        verse_texts[verse_id].append(verse_part_text)
-
-    # 2️⃣ Concatenate the parts for each verse
-    concatenated_verses = {
-        verse_id: " ".join(parts)
-        for verse_id, parts in verse_texts.items()
-    }
-
-    # Build list of most common words
-    word_counter = Counter()
-    cooc_counter = Counter()
-
-    custom_stopwords = STOPWORDS.union({"thee", "thou", "thy", "ye", "unto", "shall", "hath", ""})
-    for verse_id, verse_text in concatenated_verses.items():
-        words = [word for word in verse_text.split(" ") if word.lower().strip() not in custom_stopwords and word.lower().strip() != search_input]
-        word_counter.update(words) 
-    
-    top_words = set([w for w, _ in word_counter.most_common(30)])
-
-    for wlist in concatenated_verses.values():
-        unique = set([w for w in wlist.split(" ") if w in top_words])
-        for w1 in unique:
-            for w2 in unique:
-                if w1 < w2:
-                    cooc_counter[(w1, w2)] += 1
-
-    edges = [(w1, w2, c) for (w1, w2), c in cooc_counter.items() if c >= 1]
-
-    # Convert top_words to a sorted list
-    top_words_list = sorted(top_words)
-    word_index = {word: i for i, word in enumerate(top_words_list)}
-
-    # Initialize co-occurrence matrix
-    cooc_matrix = np.zeros((len(top_words_list), len(top_words_list)))
+    # --- Related Words ---
+    st.subheader("🧭 Related Words")
+    try:
+        df_related = service.related_words(query)
+    except FileNotFoundError:
+        df_related = None
+        st.info("No embeddings found. Run `python -m src.ingestion.strongs_embeddings` first.")
+
+    if df_related is not None:
+        if not df_related.empty:
+            st.dataframe(
+                df_related.rename(columns={"hebrew_id": "Strong's ID", "rendering": "Rendering",
+                                           "verse_count": "Verses", "similarity": "Similarity"}),
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.info("No related words found.")
 
-    # Fill matrix using cooc_counter
-    for (w1, w2), count in cooc_counter.items():
-        if w1 in word_index and w2 in word_index:
-            i, j = word_index[w1], word_index[w2]
-            cooc_matrix[i, j] = count
-            cooc_matrix[j, i] = count  # Symmetric
+    # --- Strong's ID Co-occurrence Network ---
+    if search_type == "Strong's ID":
+        st.subheader("🕸️ Strong's ID Co-occurrence Network")
+        try:
+            nodes, edges = service.ego_network(query)
+        except FileNotFoundError:
+            st.info("No precomputed network found. Run `python -m src.ingestion.cooccurrence_network` first.")
+        else:
+            if edges:
+                components.html(render_ego_network(nodes, edges, center=search_input), height=620)
+            else:
+                st.info("No co-occurring Strong's IDs found.")
 
-    # Create DataFrame for seaborn
-    df_cooc = pd.DataFrame(cooc_matrix, index=top_words_list, columns=top_words_list)
+    # --- Surrounding Words + Co-occurrence ---
+    st.subheader("🔍 Surrounding Word Co-occurrence Heatmap")
+    verse_data = service.verse_texts(query)
+    concatenated_verses = verse_data["verses"]
+    df_cooc = service.surrounding_words(query)
+    top_words_list = df_cooc.index.tolist()
 
     fig_heat = px.imshow(
     df_cooc,
@@ -381,40 +300,14 @@ if st.session_state.base_query:
 
     # Iterate over concatenated verses and display
     for verse_id, text in concatenated_verses.items():
-        # Use regex to highlight all occurrences (case-insensitive)
-        if search_type == "English word":
-            search_word = search_input
-        else:
-            verse_query = {
-                "query": {
-                    "bool": {
-                        "must": [
-                            {
-                                "term": {
-                                    "bible_verse": verse_id
-                                }
-                            }
-                        ],
-                        "filter": [
-                            {
-                                "term": {
-                                    "version": version_filter
-                                }
-                            },
-                            {
-                                "term": {
-                                    "hebrew_id": search_input
-                                }
-                            }
-                        ]
-                    }
-                }
-            }
-
-            verse_query_results = es.search(index=cfg.ES_VERSE_INDEX_NAME, body=verse_query)
-            search_word = verse_query_results['hits']['hits'][0]['_source']['verse_part']
-
-        pattern = re.compile(re.escape(search_word), re.IGNORECASE)
+        # Use regex to highlight all occurrences (case-insensitive), longest words first
+        search_words = sorted(set(verse_data["highlights"].get(verse_id, [])), key=len, reverse=True)
+
+        if not search_words:
+            st.markdown(f"{verse_id}: {text}", unsafe_allow_html=True)
+            continue
+
+        pattern = re.compile("|".join(re.escape(word) for word in search_words), re.IGNORECASE)
         
         highlighted_text = pattern.sub(
             lambda m: f"<span style='background-color: #ccffcc; color: #006600'><b>{m.group(0)}</b></span>",
@@ -422,4 +315,65 @@ if st.session_state.base_query:
         )
         
         # Display verse with highlighted term
-        st.markdown(f"{verse_id}: {highlighted_text}", unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown(f"{verse_id}: {highlighted_text}", unsafe_allow_html=True)
+
+    # --- Export All Occurrences ---
+    st.markdown("## ⬇️ Export All Occurrences")
+    col1, col2 = st.columns(2)
+    with col1:
+        export_format = st.selectbox("Export format:", EXPORT_FORMATS)
+    with col2:
+        export_all_versions = st.checkbox("Include all versions", disabled=search_type == "Boolean expression")
+
+    if st.button("Prepare export"):
+        discard_export()
+        # Count first, so an export too large to download is never written
+        export_rows = service.export_count(query, all_versions=export_all_versions)
+        if export_rows > cfg.EXPORT_DOWNLOAD_MAX_ROWS:
+            st.session_state.export_too_large = export_rows
+        else:
+            # Pages stream to a temp file, so the export itself runs in constant memory
+            export = TemporaryExport(export_format)
+            try:
+                with st.spinner("Exporting every matching verse part..."):
+                    export.rows = service.export(query, export.path, fmt=export_format,
+                                                 all_versions=export_all_versions)
+            except Exception:
+                export.discard()
+                raise
+            st.session_state.export = export
+
+    export = st.session_state.export
+    if export is not None:
+        # The download button holds the whole file in server memory, hence the row cap;
+        # export.data reads it once rather than on every rerun
+        st.download_button(
+            f"Download {export.rows:,} verse parts ({export.fmt})",
+            data=export.data,
+            file_name=f"{re.sub(r'[^A-Za-z0-9]+', '_', search_input)}_occurrences.{export.fmt}"
+        )
+    elif st.session_state.export_too_large:
+        export_params = {"q": search_input, "version": version_filter, "all_versions": export_all_versions,
+                         "type": {v: k for k, v in SEARCH_TYPE_SLUGS.items()}[search_type]}
+        if query.verse_range:
+            export_params.update(verse_low=query.verse_range[0], verse_high=query.verse_range[1])
+        st.info(
+            f"This export has {st.session_state.export_too_large:,} verse parts, too many to download "
+            f"through the app (the limit is {cfg.EXPORT_DOWNLOAD_MAX_ROWS:,}). Stream it from the JSON API instead:\n\n"
+            f"`curl --compressed -o occurrences.jsonl \"http://<api-host>:{cfg.API_PORT}/search/export?"
+            f"{urlencode(export_params)}\"`"
+        )
+
+    # --- Verse in Context ---
+    if concatenated_verses:
+        st.markdown("## 📜 Verse in Context")
+        context_verse = st.selectbox("Show context for:", list(concatenated_verses.keys()))
+        context_radius = st.slider("Surrounding verses (±N)", 1, cfg.CONTEXT_MAX_RADIUS, 2)
+        center_key = verse_data["keys"][context_verse]
+
+        # One numeric range query on verse_key fetches the whole window
+        for key, text in service.context(query, center_key, context_radius).items():
+            line = f"**{format_verse_key(key)}** {text}"
+            if key == center_key:
+                line = f"<span style='background-color: #ccffcc'>{line}</span>"
+            st.markdown(line, unsafe_allow_html=True)
@@ -0,0 +1,28 @@
+from pyvis.network import Network
+
+
+def render_ego_network(nodes, edges, center, height="600px"):
+    """
+    Render an ego-network as a standalone interactive pyvis HTML document.
+
+    :param nodes: List of (hebrew_id, verse_count) tuples.
+    :param edges: List of (source, target, weight) tuples.
+    :param center: Strong's ID to highlight as the ego node.
+    :param height: CSS height of the rendered network.
+    :return: HTML string suitable for st.components.v1.html.
+    """
+    net = Network(height=height, width="100%", cdn_resources="remote")
+    for strongs_id, verse_count in nodes:
+        net.add_node(
+            strongs_id,
+            label=strongs_id,
+            title=f"{strongs_id}: {verse_count:,} verses",
+            value=verse_count,
+            color="#006600" if strongs_id == center else "#97c2fc"
+        )
+    for source, target, weight in edges:
+        net.add_edge(source, target, value=weight, title=f"{weight:,} shared verses")
+
+    # Few nodes, so a short stabilization keeps first paint well under a second
+    net.set_options('{"physics": {"stabilization": {"iterations": 100}}}')
+    return net.generate_html()